@@ -1,7 +1,7 @@
 from __future__ import annotations
 
 from pathlib import Path
-from typing import List, Optional
+from typing import List, Optional, Set
 import subprocess
 import sys
 import logging
@@ -62,6 +62,8 @@ class CellposeSubprocessAdapter(CellposeIntegrationPort):
             "--dir", str(tmpdir_path),
             "--pretrained_model", params.model_type,
             "--diameter", str(params.cell_diameter),
+            "--flow_threshold", str(params.flow_threshold),
+            "--cellprob_threshold", str(params.probability_threshold),
             "--savedir", str(tmpdir_path),
             "--save_tif",
             "--no_npy",
@@ -89,40 +91,100 @@ class CellposeSubprocessAdapter(CellposeIntegrationPort):
             shutil.copy2(str(mask_src), str(mask_dst))
         return mask_dst if mask_dst.exists() else None
 
-    def _process_single_image(
-        self, img: Path, output_dir: Path, params: SegmentationParameters
+    def _batch_images(self, images: List[Path]) -> List[List[Path]]:
+        """Group images into batches whose file names are unique within a batch."""
+        batches: List[List[Path]] = []
+        batch_names: List[Set[str]] = []
+        for img in images:
+            for batch, names in zip(batches, batch_names):
+                if img.name not in names:
+                    batch.append(img)
+                    names.add(img.name)
+                    break
+            else:
+                batches.append([img])
+                batch_names.append({img.name})
+        return batches
+
+    def _collect_mask(
+        self, tmpdir_path: Path, output_dir: Path, img: Path, allow_generic: bool
     ) -> Optional[Path]:
-        """Process a single image through Cellpose and return the mask path if successful."""
+        """Move the mask Cellpose produced for *img* into the output directory."""
+        exact = tmpdir_path / f"{img.stem}_cp_masks.tif"
+        mask_candidates = [exact] if exact.exists() else []
+        mask_candidates.extend(self._find_mask_candidates(tmpdir_path, img.stem))
+        if allow_generic:
+            # Also check for generic mask files
+            mask_candidates.extend(tmpdir_path.glob("*mask*.tif*"))
+
+        if mask_candidates:
+            return self._move_mask_to_output(mask_candidates[0], output_dir, img.stem)
+
+        # Fallback: check output_dir for pre-created outputs
+        odir_candidates = self._find_mask_candidates(output_dir, img.stem)
+        if odir_candidates:
+            return odir_candidates[0]
+
+        logger.warning(
+            "Cellpose completed but no mask output located for %s", img
+        )
+        return None
+
+    def _process_batch(
+        self, batch: List[Path], output_dir: Path, params: SegmentationParameters
+    ) -> Optional[List[Path]]:
+        """Segment a batch of images with one Cellpose run.
+
+        Cellpose loads the model once per process, so segmenting a whole
+        directory in one run avoids paying interpreter start-up and model
+        loading for every image.
+
+        Returns:
+            Mask paths located for the batch, or None if Cellpose failed.
+        """
         with tempfile.TemporaryDirectory(prefix="cellpose_") as tmpdir:
             tmpdir_path = Path(tmpdir)
-            tmp_img = tmpdir_path / img.name
-            self._copy_image_to_temp(img, tmp_img)
+            for img in batch:
+                self._copy_image_to_temp(img, tmpdir_path / img.name)
 
             cmd = self._build_cellpose_command(tmpdir_path, params)
-            logger.info("Running Cellpose: %s", " ".join(cmd[:5]) + " ...")
+            logger.info(
+                "Running Cellpose on %d image(s): %s",
+                len(batch),
+                " ".join(cmd[:5]) + " ...",
+            )
             proc = subprocess.run(cmd, capture_output=True, text=True)
 
             if proc.returncode != 0:
-                logger.error("Cellpose failed for %s: %s", img, proc.stderr)
+                logger.error(
+                    "Cellpose failed for %s: %s",
+                    ", ".join(str(img) for img in batch),
+                    proc.stderr,
+                )
                 return None
 
-            # Find produced mask in temp dir
-            mask_candidates = self._find_mask_candidates(tmpdir_path, img.stem)
-            # Also check for generic mask files
-            mask_candidates.extend(tmpdir_path.glob("*mask*.tif*"))
-
-            if mask_candidates:
-                return self._move_mask_to_output(mask_candidates[0], output_dir, img.stem)
-
-            # Fallback: check output_dir for pre-created outputs
-            odir_candidates = self._find_mask_candidates(output_dir, img.stem)
-            if odir_candidates:
-                return odir_candidates[0]
-
-            logger.warning(
-                "Cellpose completed but no mask output located for %s", img
+            generated: List[Path] = []
+            for img in batch:
+                mask = self._collect_mask(
+                    tmpdir_path, output_dir, img, allow_generic=len(batch) == 1
+                )
+                if mask:
+                    generated.append(mask)
+            return generated
+
+    def _run_batch(
+        self, batch: List[Path], output_dir: Path, params: SegmentationParameters
+    ) -> Optional[List[Path]]:
+        """Run _process_batch, logging unexpected errors as an empty result."""
+        try:
+            return self._process_batch(batch, output_dir, params)
+        except Exception as exc:
+            logger.error(
+                "Error running Cellpose for %s: %s",
+                ", ".join(str(img) for img in batch),
+                exc,
             )
-            return None
+            return []
 
     def run_segmentation(
         self,
@@ -142,12 +204,18 @@ class CellposeSubprocessAdapter(CellposeIntegrationPort):
         output_dir.mkdir(parents=True, exist_ok=True)
         generated: List[Path] = []
 
-        for img in images:
-            try:
-                result = self._process_single_image(img, output_dir, params)
-                if result:
-                    generated.append(result)
-            except Exception as exc:
-                logger.error("Error running Cellpose for %s: %s", img, exc)
+        for batch in self._batch_images(images):
+            masks = self._run_batch(batch, output_dir, params)
+            if masks is None and len(batch) > 1:
+                # Retry one image at a time so a single bad image does not
+                # cost the masks of the rest of the batch
+                logger.warning(
+                    "Retrying %d images individually after a failed batch",
+                    len(batch),
+                )
+                masks = []
+                for img in batch:
+                    masks.extend(self._run_batch([img], output_dir, params) or [])
+            generated.extend(masks or [])
 
         return generated
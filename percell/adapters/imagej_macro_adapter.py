@@ -24,6 +24,10 @@ PROGRESS_PATTERN = re.compile(r"^[A-Z_]+_(ROI|CELL|MASK|FILE):\s*(\d+)(?:/(\d+))
 # Sentinel value to signal the reader thread has finished
 _SENTINEL = object()
 
+# System property a chain wrapper sets so that chainable macros skip their
+# own MACRO_DONE/Quit and leave both to the end of the chain
+MACRO_CHAIN_PROPERTY = "percell.macro.chain"
+
 # Macro completion marker printed by every .ijm macro as its last
 # meaningful output line.  The adapter watches for this to know
 # that the macro's work is done (even if the JVM hangs afterwards).
@@ -239,6 +243,47 @@ class ImageJMacroAdapter(ImageJIntegrationPort):
         else:
             self._stream_without_progress(process)
 
+    @staticmethod
+    def _macro_string(value: str) -> str:
+        """Quote a value as an ImageJ macro string literal."""
+        return '"' + value.replace("\\", "\\\\").replace('"', '\\"') + '"'
+
+    def _build_chain_macro(self, macros: List[Tuple[Path, List[str]]]) -> str:
+        """Build a macro that runs each (macro_path, args) pair via runMacro."""
+        prop = self._macro_string(MACRO_CHAIN_PROPERTY)
+        lines = [f'call("java.lang.System.setProperty", {prop}, "1");']
+        for macro_path, args in macros:
+            lines.append(
+                f"runMacro({self._macro_string(str(macro_path))}, "
+                f"{self._macro_string(' '.join(args))});"
+            )
+        lines.append(f'call("java.lang.System.setProperty", {prop}, "0");')
+        lines.append(f'print("{MACRO_DONE_SENTINEL}");')
+        lines.append('run("Quit");')
+        return "\n".join(lines) + "\n"
+
+    def run_macros(self, macros: List[Tuple[Path, List[str]]]) -> int:
+        """Run several macros in order within a single ImageJ launch.
+
+        Saves one JVM start-up per additional macro. The macros must skip
+        their own MACRO_DONE/Quit while MACRO_CHAIN_PROPERTY is set.
+        """
+        if len(macros) == 1:
+            macro_path, args = macros[0]
+            return self.run_macro(macro_path, args)
+
+        prefix = "+".join(Path(macro_path).stem for macro_path, _ in macros) + "_"
+        fd, chain_path = tempfile.mkstemp(prefix=prefix, suffix=".ijm")
+        try:
+            with os.fdopen(fd, "w") as f:
+                f.write(self._build_chain_macro(macros))
+            return self.run_macro(Path(chain_path), [])
+        finally:
+            try:
+                os.remove(chain_path)
+            except OSError:
+                pass
+
     def run_macro(self, macro_path: Path, args: List[str]) -> int:
         """Execute an ImageJ macro and return the exit code."""
         cmd = self._build_command(macro_path, args)
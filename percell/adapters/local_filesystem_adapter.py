@@ -1,7 +1,9 @@
 from __future__ import annotations
 
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import List
+from typing import List, Optional, Tuple
+import os
 import shutil
 import fnmatch
 
@@ -34,6 +36,28 @@ class LocalFileSystemAdapter(FileManagementPort):
             return
         shutil.copy2(src, dst)
 
+    def copy_many(self, pairs: List[Tuple[Path, Path]], overwrite: bool = False) -> None:
+        """Copy many files on a thread pool so per-file syscall latency overlaps.
+
+        Every pair is attempted; failures are collected and raised together.
+        """
+        if not pairs:
+            return
+
+        def copy_pair(pair: Tuple[Path, Path]) -> Optional[str]:
+            src, dst = pair
+            try:
+                self.copy(src, dst, overwrite=overwrite)
+            except OSError as e:
+                return f"{src} -> {dst}: {e}"
+            return None
+
+        workers = min(32, (os.cpu_count() or 1) * 4, len(pairs))
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            errors = [error for error in pool.map(copy_pair, pairs) if error]
+        if errors:
+            raise OSError(f"Failed to copy {len(errors)} file(s): " + "; ".join(errors))
+
     def move(self, src: Path, dst: Path, overwrite: bool = False) -> None:
         src = Path(src)
         dst = Path(dst)
@@ -7,6 +7,12 @@ from typing import Tuple, Optional
 import numpy as np
 from PIL import Image
 
+try:
+    import tifffile
+    HAVE_TIFFFILE = True
+except ImportError:
+    HAVE_TIFFFILE = False
+
 from percell.ports.driven.image_processing_port import ImageProcessingPort
 from percell.domain.services.image_metadata_service import ImageMetadataService
 from percell.domain.models import ImageMetadata
@@ -20,6 +26,17 @@ class PILImageProcessingAdapter(ImageProcessingPort):
         self.metadata_service = ImageMetadataService(logger)
 
     def read_image(self, path: Path) -> np.ndarray:
+        """Read the first plane of an image.
+
+        TIFFs are read with tifffile, which decodes compressed strips and
+        tiles on several threads; Pillow decodes them on one. Pillow remains
+        the reader for other formats and for TIFFs tifffile cannot decode.
+        """
+        if HAVE_TIFFFILE and Path(path).suffix.lower() in ('.tif', '.tiff'):
+            try:
+                return tifffile.imread(path, key=0)
+            except Exception:
+                pass
         with Image.open(path) as im:
             return np.array(im)
 
@@ -76,4 +93,21 @@ class PILImageProcessingAdapter(ImageProcessingPort):
         im = im.resize((target_w, target_h), Image.NEAREST if image.ndim == 2 else Image.BILINEAR)
         return np.array(im)
 
+    def bin_images(self, stack: np.ndarray, factor: int) -> np.ndarray:
+        """Bin an (N, H, W[, C]) stack with a single reshape-and-mean."""
+        if factor <= 1:
+            return stack
+        n, h, w = stack.shape[:3]
+        new_h = (h // factor) * factor
+        new_w = (w // factor) * factor
+        cropped = stack[:, :new_h, :new_w, ...]
+        reshaped = cropped.reshape(n, new_h // factor, factor, new_w // factor, factor, *stack.shape[3:])
+        return reshaped.mean(axis=(2, 4)).astype(stack.dtype)
 
+    def resize_batch(self, stack: np.ndarray, target_hw: Tuple[int, int]) -> np.ndarray:
+        """Resize each image of an (N, H, W[, C]) stack into a preallocated output."""
+        target_h, target_w = target_hw
+        out = np.empty((stack.shape[0], target_h, target_w, *stack.shape[3:]), dtype=stack.dtype)
+        for i, image in enumerate(stack):
+            out[i] = self.resize(image, target_hw)
+        return out
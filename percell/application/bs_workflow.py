@@ -77,17 +77,17 @@ class BSWorkflow:
         has_stress_granules = self._check_for_ch1_files(bs_dir)
 
         if has_stress_granules:
-            # Step 2a: Run P-body macro with SG subtraction
+            # Steps 2-3: Run the P-body macro (with SG subtraction) and the
+            # stress granule macro in a single ImageJ launch
             logger.info("Step 2: Processing P-body data with SG subtraction")
-            pb_macro_path = self._get_macro_path("pb_background_subtraction.ijm")
-            self._imagej.run_macro(pb_macro_path, [str(bs_dir)])
-            logger.info("P-body processing complete")
-
-            # Step 3: Run stress granule macro
             logger.info("Step 3: Processing stress granule data")
+            pb_macro_path = self._get_macro_path("pb_background_subtraction.ijm")
             sg_macro_path = self._get_macro_path("sg_background_subtraction.ijm")
-            self._imagej.run_macro(sg_macro_path, [str(bs_dir)])
-            logger.info("Stress granule processing complete")
+            self._imagej.run_macros([
+                (pb_macro_path, [str(bs_dir)]),
+                (sg_macro_path, [str(bs_dir)]),
+            ])
+            logger.info("P-body and stress granule processing complete")
         else:
             # Step 2b: Run P-body only macro (no SG subtraction)
             logger.info("Step 2: No ch1 files detected, processing P-body only")
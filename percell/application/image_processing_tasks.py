@@ -6,7 +6,7 @@ Provides orchestration functions that delegate to domain services for business l
 """
 
 from pathlib import Path
-from typing import Iterable, Optional, Set, List, Tuple
+from typing import Iterable, Iterator, Optional, Set, List, Tuple
 from percell.ports.driven.image_processing_port import ImageProcessingPort
 from percell.ports.driven.file_management_port import FileManagementPort
 from percell.ports.driven.progress_report_port import ProgressReportPort
@@ -351,7 +351,9 @@ def _accumulate_masks(files: list[Path], combined: np.ndarray, imgproc) -> np.nd
     for f in files:
         try:
             img = imgproc.read_image(f)
-            combined = np.maximum(combined, img.astype(np.uint8))
+            # Masks are usually uint8 already: skip the cast copy and reduce
+            # into the existing buffer rather than allocating a new one
+            np.maximum(combined, img.astype(np.uint8, copy=False), out=combined)
         except Exception:
             continue
     return combined
@@ -818,22 +820,18 @@ def _cluster_cells_gmm(
     gmm = GaussianMixture(n_components=n_clusters, random_state=42, n_init=3)
     labels = gmm.fit_predict(data)
 
-    # Reorder labels so cluster 0 has lowest mean AUC
-    cluster_means = []
-    for i in range(n_clusters):
-        mask = labels == i
-        if np.any(mask):
-            cluster_means.append((i, auc_values[mask].mean()))
-        else:
-            cluster_means.append((i, float('inf')))
-
-    # Sort by mean AUC
-    cluster_means.sort(key=lambda x: x[1])
+    # Reorder labels so cluster 0 has lowest mean AUC. Per-cluster sums and
+    # counts come from one bincount pass; empty clusters sort last.
+    counts = np.bincount(labels, minlength=n_clusters)
+    sums = np.bincount(labels, weights=auc_values, minlength=n_clusters)
+    cluster_means = np.full(n_clusters, np.inf)
+    np.divide(sums, counts, out=cluster_means, where=counts > 0)
 
-    # Create mapping from old label to new label
-    label_map = {old: new for new, (old, _) in enumerate(cluster_means)}
+    # Map old label -> rank of its mean
+    label_map = np.empty(n_clusters, dtype=np.intp)
+    label_map[np.argsort(cluster_means, kind='stable')] = np.arange(n_clusters)
 
-    return np.array([label_map[lbl] for lbl in labels])
+    return label_map[labels]
 
 
 def _process_region_auto_clusters(
@@ -2375,28 +2373,27 @@ def _roi_indices_for_timepoint(
 def _ordered_roi_bytes_for_indices(
     tp_data: dict,
     roi_indices_to_keep: List[Tuple[int, int]],
-) -> List[bytes]:
-    """Extract ROI bytes in track order from timepoint data."""
-    roi_bytes_ordered: List[bytes] = []
+) -> Iterator[bytes]:
+    """Yield ROI bytes in track order from timepoint data."""
     for _track_id, roi_idx in roi_indices_to_keep:
         roi_name = tp_data['names'][roi_idx]
         roi_byte_data = tp_data['roi_bytes'].get(roi_name)
         if roi_byte_data:
-            roi_bytes_ordered.append(roi_byte_data)
-    return roi_bytes_ordered
+            yield roi_byte_data
 
 
 def _save_timepoint_rois_and_report(
     tp_data: dict,
-    roi_bytes_ordered: List[bytes],
+    roi_bytes_ordered: Iterable[bytes],
     backup_dir: Path,
     replace_originals: bool,
 ) -> bool:
     """Save reordered ROI set and print result. Returns True if save succeeded."""
     original_file = tp_data['file']
     output_file = original_file if replace_originals else backup_dir / original_file.name
-    if _save_zip_from_bytes(roi_bytes_ordered, output_file):
-        print(f"  Reordered: {original_file.name} ({len(roi_bytes_ordered)} ROIs)")
+    written = _save_zip_from_bytes(roi_bytes_ordered, output_file)
+    if written is not None:
+        print(f"  Reordered: {original_file.name} ({written} ROIs)")
         return True
     print(f"  Warning: Failed to save {output_file.name}")
     return False
@@ -2458,16 +2455,22 @@ def _save_tracked_rois(
     return success
 
 
-def _save_zip_from_bytes(roi_bytes_list: List[bytes], output_zip_path: str | Path) -> bool:
+def _save_zip_from_bytes(roi_bytes: Iterable[bytes], output_zip_path: str | Path) -> Optional[int]:
+    """Write ROIs to a zip as they are produced.
+
+    Returns:
+        Number of ROIs written, or None if the zip could not be written
+    """
     import zipfile
+    written = 0
     try:
         with zipfile.ZipFile(str(output_zip_path), 'w') as z:
-            for i, data in enumerate(roi_bytes_list):
-                name = f"ROI_{i+1:03d}.roi"
-                z.writestr(name, data)
-        return True
+            for data in roi_bytes:
+                written += 1
+                z.writestr(f"ROI_{written:03d}.roi", data)
+        return written
     except Exception:
-        return False
+        return None
 
 
 def _collect_roi_files_by_timepoint(root: Path, timepoints: List[str]) -> dict[str, List[Path]]:
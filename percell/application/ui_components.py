@@ -45,3 +45,40 @@ def show_header(ui: UserInterfacePort) -> None:
         ui.info(colored_line)
 
 
+class BatchedUserInterface(UserInterfacePort):
+    """UI wrapper that buffers info messages and emits them in batches.
+
+    Long per-file loops produce one ``info`` call per line; joining them cuts
+    the number of terminal writes. Errors and prompts flush the buffer first
+    so output ordering is preserved. Use as a context manager to guarantee the
+    final flush.
+    """
+
+    def __init__(self, ui: UserInterfacePort, batch_size: int = 64) -> None:
+        self._ui = ui
+        self._batch_size = batch_size
+        self._buffer: list[str] = []
+
+    def info(self, message: str) -> None:
+        self._buffer.append(message)
+        if len(self._buffer) >= self._batch_size:
+            self.flush()
+
+    def error(self, message: str) -> None:
+        self.flush()
+        self._ui.error(message)
+
+    def prompt(self, message: str) -> str:
+        self.flush()
+        return self._ui.prompt(message)
+
+    def flush(self) -> None:
+        if self._buffer:
+            self._ui.info("\n".join(self._buffer))
+            self._buffer.clear()
+
+    def __enter__(self) -> "BatchedUserInterface":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.flush()
@@ -247,6 +247,9 @@ class SegmentationPreferences:
     performance_target: str = "balanced"  # "fast", "balanced", "quality"
     preferred_model: Optional[str] = None
     expected_cell_diameter: Optional[float] = None
+    # Opt-in: turn off Cellpose's flow-error check (flow_threshold=0) to save
+    # mask time, keeping masks that check would have dropped
+    skip_flow_check: bool = False
 
 
 @dataclass(slots=True)
@@ -11,15 +11,38 @@ from __future__ import annotations
 import shutil
 import subprocess
 from pathlib import Path
-from typing import Optional
+from typing import List, Optional, Tuple
 import logging
 
+from percell.ports.driven.file_management_port import FileManagementPort
+
 logger = logging.getLogger(__name__)
 
 
 class BSPreprocessingService:
     """Service for preparing percell data for background subtraction intensity analysis."""
 
+    def __init__(self, file_manager: Optional[FileManagementPort] = None):
+        """Initialize the service.
+
+        Args:
+            file_manager: Optional filesystem port used for batched copies;
+                files are copied one at a time with shutil if not provided
+        """
+        self.file_manager = file_manager
+
+    def _copy_files(self, pairs: List[Tuple[Path, Path]]) -> None:
+        """Copy (source, destination) pairs, overwriting existing files.
+
+        Args:
+            pairs: Files to copy
+        """
+        if self.file_manager is not None:
+            self.file_manager.copy_many(pairs, overwrite=True)
+            return
+        for src, dst in pairs:
+            shutil.copy2(src, dst)
+
     def _detect_channel_pattern(self, data_dir: Path) -> str:
         """Detect whether files use ch0/ch1/ch2 or ch00/ch01/ch02 naming.
 
@@ -119,10 +142,7 @@ class BSPreprocessingService:
         mask_files = [f for f in source_dir.glob("**/*.tif") if not f.name.startswith("._")]
         logger.info(f"Copying {len(mask_files)} mask files")
 
-        for mask_file in mask_files:
-            dest_file = dest_dir / mask_file.name
-            shutil.copy2(mask_file, dest_file)
-            logger.debug(f"Copied {mask_file.name}")
+        self._copy_files([(mask_file, dest_dir / mask_file.name) for mask_file in mask_files])
 
     def _copy_channel_data(
         self,
@@ -139,15 +159,14 @@ class BSPreprocessingService:
             dest_dir: Destination directory for raw data
             channels: List of channel identifiers to copy (e.g., ["ch1", "ch2"])
         """
+        pairs: List[Tuple[Path, Path]] = []
         for channel in channels:
             # Use recursive glob to find all channel files, excluding macOS dot files
             channel_files = [f for f in source_dir.glob(f"**/*{channel}*.tif") if not f.name.startswith("._")]
             logger.info(f"Copying {len(channel_files)} {channel} files")
+            pairs.extend((channel_file, dest_dir / channel_file.name) for channel_file in channel_files)
 
-            for channel_file in channel_files:
-                dest_file = dest_dir / channel_file.name
-                shutil.copy2(channel_file, dest_file)
-                logger.debug(f"Copied {channel_file.name}")
+        self._copy_files(pairs)
 
     def copy_ch0_to_processed(
         self,
@@ -187,6 +206,7 @@ class BSPreprocessingService:
         ch0_files = [f for f in raw_data_dir.glob(f"**/*{ch0_channel}*.tif") if not f.name.startswith("._")]
         logger.info(f"Found {len(ch0_files)} {ch0_channel} files to copy")
 
+        pairs: List[Tuple[Path, Path]] = []
         for ch0_file in ch0_files:
             # Extract base name without channel and suffix
             # Example: MAX_z-stack_Untreated_Merged_ch0_t00.tif
@@ -233,8 +253,10 @@ class BSPreprocessingService:
             new_filename = f"{condition_name}_Cap_Intensity.tif"
             dest_file = matched_dir / new_filename
 
-            shutil.copy2(ch0_file, dest_file)
-            logger.info(f"Copied {ch0_file.name} -> {condition_name}/{new_filename}")
+            pairs.append((ch0_file, dest_file))
+            logger.info(f"Copying {ch0_file.name} -> {condition_name}/{new_filename}")
+
+        self._copy_files(pairs)
 
     def extract_condition_from_filename(self, filename: str) -> Optional[str]:
         """Extract condition identifier from a mask or raw data filename.
@@ -113,6 +113,10 @@ class CellSegmentationService:
         # Defaults
         diameter = prefs.expected_cell_diameter if prefs.expected_cell_diameter else 25.0
         flow = 0.4 if prefs.performance_target != "fast" else 0.2
+        # A flow threshold of 0 turns off Cellpose's flow-error check, which
+        # recomputes flows from every mask and is about half of CPU mask time
+        if prefs.skip_flow_check:
+            flow = 0.0
         prob = -1.0 if prefs.performance_target == "fast" else 0.0
         model = prefs.preferred_model or "nuclei"
         return SegmentationParameters(
@@ -7,15 +7,20 @@ preserving metadata and applying selection filters.
 from __future__ import annotations
 
 from pathlib import Path
-from typing import Optional, Iterable, Set
+from typing import Dict, List, Optional, Iterable, Set, Tuple
 import logging
 
+import numpy as np
+
 from percell.domain.services.file_naming_service import FileNamingService
 from percell.ports.driven.image_processing_port import ImageProcessingPort
 
 
 logger = logging.getLogger(__name__)
 
+# Images read before each batched bin; bounds the memory held by one stack
+BIN_BATCH_SIZE = 8
+
 
 class ImageBinningService:
     """Domain service for image binning operations.
@@ -58,19 +63,24 @@ class ImageBinningService:
             Number of images successfully processed
         """
         output_dir.mkdir(parents=True, exist_ok=True)
-        processed_count = 0
 
+        selected: List[Path] = []
         for file_path in input_dir.glob("**/*.tif"):
             try:
                 if self._should_process_file(
                     file_path, input_dir, conditions, regions, timepoints, channels
                 ):
-                    if self._process_single_image(file_path, input_dir, output_dir, bin_factor):
-                        processed_count += 1
+                    selected.append(file_path)
             except Exception as e:
                 logger.debug(f"Skipping file {file_path.name}: {e}")
                 continue
 
+        processed_count = 0
+        for start in range(0, len(selected), BIN_BATCH_SIZE):
+            processed_count += self._process_batch(
+                selected[start:start + BIN_BATCH_SIZE], input_dir, output_dir, bin_factor
+            )
+
         return processed_count
 
     def _should_process_file(
@@ -119,36 +129,56 @@ class ImageBinningService:
 
         return True
 
-    def _process_single_image(
+    def _process_batch(
         self,
-        file_path: Path,
+        file_paths: List[Path],
         input_dir: Path,
         output_dir: Path,
         bin_factor: int,
-    ) -> bool:
-        """Process a single image file (bin and save).
+    ) -> int:
+        """Bin and save a batch of images.
+
+        Images with the same shape and dtype are stacked and binned with one
+        bin_images call. A file that fails to read or write is logged and
+        skipped without affecting the rest of the batch.
 
         Args:
-            file_path: Path to input image
+            file_paths: Input images in this batch
             input_dir: Root input directory
             output_dir: Root output directory
             bin_factor: Binning factor
 
         Returns:
-            True if successful, False otherwise
+            Number of images successfully processed
         """
-        try:
-            # Preserve directory structure
-            rel = file_path.relative_to(input_dir)
-            out_file = output_dir / rel.parent / f"bin{bin_factor}x{bin_factor}_{file_path.name}"
-            out_file.parent.mkdir(parents=True, exist_ok=True)
+        groups: Dict[Tuple[Tuple[int, ...], str], List[Tuple[Path, np.ndarray]]] = {}
+        for file_path in file_paths:
+            try:
+                image = self.image_processor.read_image(file_path)
+            except Exception as e:
+                logger.error(f"Error processing {file_path.name}: {e}")
+                continue
+            groups.setdefault((image.shape, image.dtype.str), []).append((file_path, image))
 
-            # Read, bin, and write image
-            image = self.image_processor.read_image(file_path)
-            binned = self.image_processor.bin_image(image, bin_factor)
-            self.image_processor.write_image(out_file, binned.astype(image.dtype))
+        processed_count = 0
+        for members in groups.values():
+            try:
+                stack = np.stack([image for _, image in members])
+                binned_stack = self.image_processor.bin_images(stack, bin_factor)
+            except Exception as e:
+                names = ", ".join(file_path.name for file_path, _ in members)
+                logger.error(f"Error binning {names}: {e}")
+                continue
 
-            return True
-        except Exception as e:
-            logger.error(f"Error processing {file_path.name}: {e}")
-            return False
+            for (file_path, image), binned in zip(members, binned_stack):
+                try:
+                    # Preserve directory structure
+                    rel = file_path.relative_to(input_dir)
+                    out_file = output_dir / rel.parent / f"bin{bin_factor}x{bin_factor}_{file_path.name}"
+                    out_file.parent.mkdir(parents=True, exist_ok=True)
+                    self.image_processor.write_image(out_file, binned.astype(image.dtype, copy=False))
+                    processed_count += 1
+                except Exception as e:
+                    logger.error(f"Error processing {file_path.name}: {e}")
+
+        return processed_count
@@ -8,7 +8,7 @@ from __future__ import annotations
 
 import logging
 from pathlib import Path
-from typing import Optional
+from typing import Iterable, Optional, Tuple
 
 try:
     import tifffile
@@ -206,7 +206,9 @@ class ImageMetadataService:
 
             # Ensure clean image data - no ROI overlays or selections embedded
             # This is particularly important for grouped cell images used in thresholding
-            self.logger.debug(f"Saving image: shape={image.shape}, dtype={image.dtype}, range=[{image.min()}, {image.max()}]")
+            if self.logger.isEnabledFor(logging.DEBUG):
+                # min/max are two full passes over the image; only pay for them when logged
+                self.logger.debug(f"Saving image: shape={image.shape}, dtype={image.dtype}, range=[{image.min()}, {image.max()}]")
 
             tifffile.imwrite(str(output_path), image, **kwargs)
             self.logger.info(f"Successfully saved {output_path.name} with tifffile")
@@ -216,6 +218,52 @@ class ImageMetadataService:
             self.logger.error(f"Error saving {output_path.name} with tifffile: {e}")
             return self._save_image_pil_fallback(image, output_path)
 
+    def save_planes_with_metadata(
+        self,
+        planes: Iterable[np.ndarray],
+        shape: Tuple[int, ...],
+        dtype: np.dtype,
+        output_path: Path,
+        metadata: Optional[ImageMetadata] = None
+    ) -> bool:
+        """Stream image planes to a TIFF file with preserved metadata.
+
+        Unlike save_image_with_metadata, the full stack is never materialized;
+        tifffile writes each plane as the iterable produces it. There is no
+        PIL fallback because the iterable can only be consumed once.
+
+        Args:
+            planes: Iterable yielding the planes of the stack in order
+            shape: Shape of the full stack, e.g. (C, Y, X)
+            dtype: Data type shared by all planes
+            output_path: Path where to save the image
+            metadata: Metadata to preserve (optional)
+
+        Returns:
+            True if successful, False otherwise
+        """
+        if not HAVE_TIFFFILE:
+            self.logger.warning(f"tifffile not available, cannot stream {output_path.name}")
+            return False
+
+        try:
+            kwargs = {"imagej": True}
+
+            if metadata and metadata.has_resolution_info():
+                kwargs.update(metadata.to_tifffile_kwargs())
+                self.logger.debug(f"Saving {output_path.name} with metadata: {list(kwargs.keys())}")
+            else:
+                self.logger.debug(f"Saving {output_path.name} without resolution metadata")
+
+            # tifffile only streams true iterators; sequences would be stacked
+            tifffile.imwrite(str(output_path), iter(planes), shape=shape, dtype=dtype, **kwargs)
+            self.logger.info(f"Successfully streamed {output_path.name} with tifffile")
+            return True
+
+        except Exception as e:
+            self.logger.error(f"Error streaming {output_path.name} with tifffile: {e}")
+            return False
+
     def _save_image_pil_fallback(self, image: np.ndarray, output_path: Path) -> bool:
         """Save image using PIL as fallback."""
         if not HAVE_PIL:
@@ -20,11 +20,14 @@ import argparse
 import json
 import os
 import re
+import dataclasses
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from datetime import datetime
 from pathlib import Path
 from typing import Dict, List, Optional, Tuple
 
 from percell.ports.driving.user_interface_port import UserInterfacePort
+from percell.application.ui_components import BatchedUserInterface
 from percell.domain.services.image_metadata_service import ImageMetadataService
 from percell.domain.models import ImageMetadata
 
@@ -33,6 +36,57 @@ import numpy as np
 import tifffile
 from PIL import Image
 
+# tifffile needs imagecodecs for LZW; probe it once instead of catching the
+# failure on every write
+try:
+    import imagecodecs
+    imagecodecs.lzw_encode(b'\x00')
+    _LZW_KWARGS = {'compression': 'lzw'}
+except Exception:
+    _LZW_KWARGS = {}
+
+# MAX projection names produced by create_max_projections_structured; 'base'
+# is the name shared by the channel pair
+_MAX_CHANNEL_NAME = re.compile(r'MAX_z-stack_(?P<base>.+)_ch(?P<ch>[01])\.tif$')
+
+# The service is stateless, so one instance is shared by every workflow step
+# (and created once per worker process on import)
+_METADATA_SERVICE = ImageMetadataService()
+
+# Header reads are small and I/O bound; a few threads are enough to overlap them
+METADATA_PREFETCH_WORKERS = 8
+
+# Above this many channel pairs, per-pair progress lines are suppressed
+VERBOSE_PAIR_LIMIT = 50
+
+# Deflate is readable by ImageJ (unlike zstd), encodes faster than LZW on 16-bit
+# data and is built on Python's zlib, so it does not depend on imagecodecs
+MERGED_COMPRESSION = 'zlib'
+
+
+def prefetch_metadata(
+    metadata_service: ImageMetadataService, files: List[Path]
+) -> Dict[Path, ImageMetadata]:
+    """Extract metadata for many files concurrently, keyed by path."""
+    if not files:
+        return {}
+    with ThreadPoolExecutor(max_workers=min(METADATA_PREFETCH_WORKERS, len(files))) as pool:
+        return dict(zip(files, pool.map(metadata_service.extract_metadata, files)))
+
+
+def stack_channels(img_ch0: np.ndarray, img_ch1: np.ndarray) -> np.ndarray:
+    """Stack two equally shaped channel images along a new leading C axis.
+
+    Fills a preallocated C-contiguous buffer directly rather than going through
+    np.stack, so each plane is copied exactly once. Mismatched dtypes are
+    promoted to their common type instead of truncating the second channel.
+    """
+    dtype = img_ch0.dtype if img_ch0.dtype == img_ch1.dtype else np.result_type(img_ch0, img_ch1)
+    merged_stack = np.empty((2,) + img_ch0.shape, dtype=dtype)
+    merged_stack[0] = img_ch0
+    merged_stack[1] = img_ch1
+    return merged_stack
+
 
 class MicroscopyMetadataExtractor:
     """Extract metadata from microscopy files with pattern analysis."""
@@ -166,13 +220,19 @@ class MicroscopyMetadataExtractor:
         for pattern in ('*.tif', '*.tiff', '*.TIF', '*.TIFF'):
             candidate_files.extend(self.base_directory.rglob(pattern))
 
-        # De-duplicate and filter hidden files
+        # De-duplicate and filter hidden files. The case-variant globs only
+        # overlap on case-insensitive filesystems, so a normalized path string
+        # is a sufficient key without resolving symlinks for every file.
         seen_paths = set()
         tif_files = []
         for f in candidate_files:
-            if f.resolve() not in seen_paths and not any(part.startswith('.') for part in f.parts):
-                seen_paths.add(f.resolve())
-                tif_files.append(f)
+            key = os.fspath(f)
+            if os.name == 'nt':
+                key = key.lower()
+            if key in seen_paths or any(part.startswith('.') for part in f.parts):
+                continue
+            seen_paths.add(key)
+            tif_files.append(f)
 
         # Group files by folder and image name
         from collections import defaultdict
@@ -216,12 +276,14 @@ def merge_channels_imagej(input_dir: Path, output_dir: Path, ui: UserInterfacePo
     Based on original merge_channels_tiff.py logic.
     """
     results = {'merged_files': [], 'errors': []}
-    metadata_service = ImageMetadataService()
+    metadata_service = _METADATA_SERVICE
 
     # Find all channel 0 files (try both ch0 and ch00 patterns)
-    # Be specific to avoid confusion between ch0 and ch00
-    ch00_files = sorted(input_dir.rglob("*ch00*.tif"))
-    ch0_files = [f for f in sorted(input_dir.rglob("*ch0*.tif")) if 'ch00' not in f.name and 'ch01' not in f.name]
+    # Be specific to avoid confusion between ch0 and ch00. A single recursive
+    # walk covers both patterns since "*ch00*" is a subset of "*ch0*".
+    all_ch0 = list(input_dir.rglob("*ch0*.tif"))
+    ch00_files = sorted(f for f in all_ch0 if 'ch00' in f.name)
+    ch0_files = sorted(f for f in all_ch0 if 'ch00' not in f.name and 'ch01' not in f.name)
 
     # Use whichever pattern has files
     if ch00_files:
@@ -238,10 +300,14 @@ def merge_channels_imagej(input_dir: Path, output_dir: Path, ui: UserInterfacePo
         ui.info("ℹ️  No channel files found")
         return results
 
+    # Read all channel 0 headers up front so the merge loop only does pixel I/O
+    metadata_cache = prefetch_metadata(metadata_service, channel_files)
+
     # Process each channel 0 file
     for ch0_file in channel_files:
-        # Generate corresponding channel 1 filename
-        ch1_file = Path(str(ch0_file).replace(ch_pattern, ch_replace))
+        # Generate corresponding channel 1 filename (leaf name only, so parent
+        # directories containing the channel token are left untouched)
+        ch1_file = ch0_file.with_name(ch0_file.name.replace(ch_pattern, ch_replace))
 
         # Check if channel 1 file exists
         if not ch1_file.exists():
@@ -257,8 +323,8 @@ def merge_channels_imagej(input_dir: Path, output_dir: Path, ui: UserInterfacePo
         ui.info(f"  Merging: {ch0_file.name} + {ch1_file.name}")
 
         try:
-            # Extract metadata from the first channel file
-            original_metadata = metadata_service.extract_metadata(ch0_file)
+            # Metadata from the first channel file (prefetched above)
+            original_metadata = metadata_cache[ch0_file]
 
             # Read both channel images using tifffile
             img_ch0 = tifffile.imread(ch0_file)
@@ -272,11 +338,11 @@ def merge_channels_imagej(input_dir: Path, output_dir: Path, ui: UserInterfacePo
             # Determine the correct axes based on the input shape
             if len(img_ch0.shape) == 3:
                 # Z-stack format: (Z, Y, X) -> merge to (C, Z, Y, X)
-                merged_stack = np.stack([img_ch0, img_ch1], axis=0)
+                merged_stack = stack_channels(img_ch0, img_ch1)
                 axes = 'CZYX'
             elif len(img_ch0.shape) == 2:
                 # Single image format: (Y, X) -> merge to (C, Y, X)
-                merged_stack = np.stack([img_ch0, img_ch1], axis=0)
+                merged_stack = stack_channels(img_ch0, img_ch1)
                 axes = 'CYX'
             else:
                 ui.error(f"    ❌ Unexpected image shape {img_ch0.shape}")
@@ -292,11 +358,8 @@ def merge_channels_imagej(input_dir: Path, output_dir: Path, ui: UserInterfacePo
 
             if not success:
                 # Fallback to basic saving
-                try:
-                    tifffile.imwrite(output_path, merged_stack, imagej=True,
-                                   compression='lzw')
-                except (KeyError, ImportError):
-                    tifffile.imwrite(output_path, merged_stack, imagej=True)
+                tifffile.imwrite(output_path, merged_stack, imagej=True,
+                                 compression=MERGED_COMPRESSION)
 
             results['merged_files'].append(str(output_path))
             ui.info(f"    ✅ Created: {output_name}")
@@ -308,10 +371,17 @@ def merge_channels_imagej(input_dir: Path, output_dir: Path, ui: UserInterfacePo
     return results
 
 
-def create_z_stacks_structured(input_dir: Path, output_dir: Path, ui: UserInterfacePort, metadata: Dict):
-    """Create Z-stacks from individual z-plane images with proper directory structure."""
+def create_z_stacks_structured(input_dir: Path, output_dir: Path, ui: UserInterfacePort, metadata: Dict,
+                               is_stitched_input: bool = False):
+    """Create Z-stacks from individual z-plane images with proper directory structure.
+
+    When ``is_stitched_input`` is True, ``input_dir`` holds the output of the
+    stitching step and stacks are built from the ``stitched_*`` files there
+    instead of the original files recorded in the metadata.
+    """
     results = {'stacks_created': [], 'errors': []}
-    metadata_service = ImageMetadataService()
+    metadata_service = _METADATA_SERVICE
+    parse_filename = MicroscopyMetadataExtractor(input_dir).parse_filename
 
     ui.info("🔍 Processing image groups for z-stack creation...")
 
@@ -334,8 +404,6 @@ def create_z_stacks_structured(input_dir: Path, output_dir: Path, ui: UserInterf
                 # Find all files in the current input directory that match this image group
                 # If input_dir is stitched directory, look for stitched files
                 # Otherwise use original metadata files
-                is_stitched_input = 'stitched' in str(input_dir).lower()
-
                 if is_stitched_input:
                     # Find stitched files for this image group
                     pattern_files = []
@@ -355,7 +423,7 @@ def create_z_stacks_structured(input_dir: Path, output_dir: Path, ui: UserInterf
                 files_by_ch_t = {}
                 for file_path in relevant_files:
                     # Parse filename (same logic for both stitched and original files)
-                    parsed = MicroscopyMetadataExtractor(input_dir).parse_filename(file_path.name)
+                    parsed = parse_filename(file_path.name)
 
                     channel = parsed['channel'] if parsed['channel'] is not None else 0
                     timepoint = parsed['timepoint'] if parsed['timepoint'] is not None else 0
@@ -365,14 +433,19 @@ def create_z_stacks_structured(input_dir: Path, output_dir: Path, ui: UserInterf
                         files_by_ch_t[key] = []
                     files_by_ch_t[key].append((parsed['z_plane'], file_path))
 
+                # Sort by z-plane and read every first-plane header concurrently
+                for z_files in files_by_ch_t.values():
+                    z_files.sort(key=lambda x: x[0])
+                metadata_cache = prefetch_metadata(
+                    metadata_service, [z_files[0][1] for z_files in files_by_ch_t.values()]
+                )
+
                 # Create z-stack for each channel/timepoint combination (like original)
                 for (channel, timepoint), z_files in files_by_ch_t.items():
-                    z_files.sort(key=lambda x: x[0])  # Sort by z-plane
-
                     try:
-                        # Extract metadata from the first z-plane file
+                        # Metadata from the first z-plane file (prefetched above)
                         first_z_file = z_files[0][1]
-                        original_metadata = metadata_service.extract_metadata(first_z_file)
+                        original_metadata = metadata_cache[first_z_file]
 
                         # Read all z-planes
                         z_stack = []
@@ -413,7 +486,7 @@ def create_z_stacks_structured(input_dir: Path, output_dir: Path, ui: UserInterf
 def create_max_projections_structured(input_dir: Path, output_dir: Path, ui: UserInterfacePort, metadata: Dict):
     """Create maximum intensity projections from z-stack TIFF files with proper directory structure."""
     results = {'projections_created': [], 'errors': []}
-    metadata_service = ImageMetadataService()
+    metadata_service = _METADATA_SERVICE
 
     ui.info("🔍 Creating maximum intensity projections...")
 
@@ -429,8 +502,12 @@ def create_max_projections_structured(input_dir: Path, output_dir: Path, ui: Use
         if not exp_z_dir.exists():
             continue
 
-        # Find all TIFF files in this experiment's z-stacks directory
-        tiff_files = list(exp_z_dir.glob('*.tif')) + list(exp_z_dir.glob('*.tiff'))
+        # Find all TIFF files in this experiment's z-stacks directory (one scan)
+        with os.scandir(exp_z_dir) as entries:
+            tiff_files = sorted(
+                Path(entry.path) for entry in entries
+                if entry.name.lower().endswith(('.tif', '.tiff')) and entry.is_file()
+            )
 
         if not tiff_files:
             continue
@@ -444,10 +521,14 @@ def create_max_projections_structured(input_dir: Path, output_dir: Path, ui: Use
                 # Extract metadata from the z-stack file
                 original_metadata = metadata_service.extract_metadata(tiff_file)
 
-                # Read the multi-page TIFF
-                with tifffile.TiffFile(tiff_file) as tif:
-                    images = tif.asarray()
-                    n_pages = len(tif.pages)
+                # Read the multi-page TIFF. Uncompressed stacks are memory-mapped
+                # so planes are paged in on demand instead of copied into RAM;
+                # compressed stacks cannot be mapped and are decoded in full.
+                try:
+                    images = tifffile.memmap(tiff_file, mode='r')
+                except ValueError:
+                    with tifffile.TiffFile(tiff_file) as tif:
+                        images = tif.asarray()
 
                 # Handle different array dimensions
                 if len(images.shape) == 2:
@@ -457,7 +538,7 @@ def create_max_projections_structured(input_dir: Path, output_dir: Path, ui: Use
                 elif len(images.shape) == 3:
                     # Standard z-stack (Z, Y, X) - create max projection
                     max_projection = np.max(images, axis=0)
-                    ui.info(f"    ✅ Max projection from {n_pages} z-planes")
+                    ui.info(f"    ✅ Max projection from {images.shape[0]} z-planes")
                 else:
                     ui.error(f"    ❌ Unexpected dimensions: {images.shape}")
                     continue
@@ -475,11 +556,7 @@ def create_max_projections_structured(input_dir: Path, output_dir: Path, ui: Use
 
                 if not success:
                     # Fallback to basic saving
-                    try:
-                        tifffile.imwrite(output_path, max_projection, imagej=True,
-                                       compression='lzw')
-                    except (KeyError, ImportError):
-                        tifffile.imwrite(output_path, max_projection, imagej=True)
+                    tifffile.imwrite(output_path, max_projection, imagej=True, **_LZW_KWARGS)
 
                 results['projections_created'].append(str(output_path))
                 ui.info(f"    ✅ Created: {output_name}")
@@ -533,7 +610,8 @@ def determine_grid_dimensions(num_tiles: int, aspect_ratio_hint: Tuple[int, int]
 def stitch_tiles_structured(input_dir: Path, output_dir: Path, ui: UserInterfacePort, metadata: Dict) -> Dict:
     """Stitch tile-scan images using snake pattern with user prompts for grid dimensions."""
     results = {'stitched_files': [], 'errors': []}
-    metadata_service = ImageMetadataService()
+    metadata_service = _METADATA_SERVICE
+    parse_filename = MicroscopyMetadataExtractor(input_dir).parse_filename
 
     ui.info("🧩 Stitching tile-scan images...")
 
@@ -604,7 +682,7 @@ def stitch_tiles_structured(input_dir: Path, output_dir: Path, ui: UserInterface
                 files_by_ch_z_t = {}
                 for file_path_str in group_data['files']:
                     file_path = Path(file_path_str)
-                    parsed = MicroscopyMetadataExtractor(input_dir).parse_filename(file_path.name)
+                    parsed = parse_filename(file_path.name)
 
                     channel = parsed['channel'] if parsed['channel'] is not None else 0
                     z_plane = parsed['z_plane'] if parsed['z_plane'] is not None else 0
@@ -692,14 +770,79 @@ def stitch_tiles_structured(input_dir: Path, output_dir: Path, ui: UserInterface
     return results
 
 
+def _merge_max_projection_pair(ch0_file: Path, ch1_file: Path, output_path: Path,
+                               folder_metadata: ImageMetadata) -> Optional[str]:
+    """Merge one ch0/ch1 MAX projection pair into a CYX composite TIFF.
+
+    Runs inside a worker process, so it reports back to the caller instead of
+    touching the UI. ``folder_metadata`` is read once per experiment folder by
+    the caller. Returns None on success or an error message on failure.
+    """
+    metadata_service = _METADATA_SERVICE
+    tmp_path = output_path.with_name(output_path.name + '.tmp')
+
+    try:
+        with tifffile.TiffFile(ch0_file) as tif_ch0, tifffile.TiffFile(ch1_file) as tif_ch1:
+            series_ch0 = tif_ch0.series[0]
+            series_ch1 = tif_ch1.series[0]
+
+            # Ensure images have the same dimensions, checked from the headers
+            # so mismatched pairs never have their pixels decoded
+            if series_ch0.shape != series_ch1.shape:
+                return "Channel dimensions don't match"
+
+            # Channels almost always share a dtype; only promote when they don't
+            dtype = series_ch0.dtype
+            if series_ch1.dtype != dtype:
+                dtype = np.result_type(dtype, series_ch1.dtype)
+
+            # Single image format: (Y, X) -> merge to (C, Y, X)
+            axes = 'CYX'
+
+            # Preserve original metadata and add axes info without mutating the
+            # instance shared by the rest of the folder
+            original_metadata = dataclasses.replace(
+                folder_metadata, imagej_metadata={**folder_metadata.imagej_metadata, 'axes': axes}
+            )
+
+            # Decode each channel only when tifffile asks for the next plane, so
+            # at most one plane is resident while the composite is written. The
+            # pool already provides the parallelism, hence maxworkers=1.
+            planes = (tif.asarray(maxworkers=1).astype(dtype, copy=False) for tif in (tif_ch0, tif_ch1))
+            success = metadata_service.save_planes_with_metadata(
+                planes, (2,) + series_ch0.shape, dtype,
+                tmp_path, original_metadata
+            )
+
+            if not success:
+                # Fallback to basic saving
+                merged_stack = stack_channels(tif_ch0.asarray(maxworkers=1), tif_ch1.asarray(maxworkers=1))
+                tifffile.imwrite(tmp_path, merged_stack, imagej=True,
+                                 compression=MERGED_COMPRESSION)
+
+        # Only a fully written file ever appears under the final name
+        os.replace(tmp_path, output_path)
+
+    except Exception as e:
+        tmp_path.unlink(missing_ok=True)
+        return str(e)
+
+    return None
+
+
 def merge_channels_from_max_projections(max_proj_dir: Path, output_dir: Path, ui: UserInterfacePort, metadata: Dict):
-    """Merge channels from MAX projection files (like original workflow)."""
+    """Merge channels from MAX projection files (like original workflow).
+
+    Pairs are collected per experiment folder and merged in a process pool,
+    since each pair is independent and dominated by TIFF decode/encode.
+    """
     results = {'merged_files': [], 'errors': []}
-    metadata_service = ImageMetadataService()
+    metadata_service = _METADATA_SERVICE
 
     ui.info("🔍 Merging channels from MAX projections...")
 
-    # Process each experiment directory
+    # Collect every (ch0, ch1, output) triple before dispatching any work
+    pairs = []
     for folder_rel in metadata['folders'].keys():
         if folder_rel != '.':
             exp_max_dir = max_proj_dir / folder_rel
@@ -708,74 +851,84 @@ def merge_channels_from_max_projections(max_proj_dir: Path, output_dir: Path, ui
             exp_max_dir = max_proj_dir
             exp_output_dir = output_dir
 
-        if not exp_max_dir.exists():
+        # One listing per folder; ch0/ch1 files are partitioned by their shared
+        # base name and then joined in memory instead of stat-ing each partner
+        try:
+            names = os.listdir(exp_max_dir)
+        except FileNotFoundError:
             continue
 
-        exp_output_dir.mkdir(parents=True, exist_ok=True)
-
-        # Find channel 0 MAX projection files
-        ch0_files = [f for f in exp_max_dir.glob("*ch0*.tif") if 'MAX_' in f.name]
+        ch0_by_base = {}
+        ch1_by_base = {}
+        for name in names:
+            match = _MAX_CHANNEL_NAME.match(name)
+            if match:
+                by_base = ch0_by_base if match.group('ch') == '0' else ch1_by_base
+                by_base[match.group('base')] = name
 
-        if not ch0_files:
+        if not ch0_by_base:
             continue
 
-        ui.info(f"📚 Found {len(ch0_files)} channel pairs to merge in {folder_rel}")
+        exp_output_dir.mkdir(parents=True, exist_ok=True)
 
-        for ch0_file in ch0_files:
-            # Find corresponding ch1 file
-            ch1_file = Path(str(ch0_file).replace("ch0", "ch1"))
+        ui.info(f"📚 Found {len(ch0_by_base)} channel pairs to merge in {folder_rel}")
 
-            if not ch1_file.exists():
-                ui.info(f"  ⚠️  No matching ch1 file for {ch0_file.name}")
-                continue
+        ch0_bases = sorted(ch0_by_base)
 
-            ui.info(f"  Merging: {ch0_file.name} + {ch1_file.name}")
+        # Resolution and ImageJ tags are constant within an acquisition folder,
+        # so read them once and share them across every pair in the folder
+        folder_metadata = metadata_service.extract_metadata(exp_max_dir / ch0_by_base[ch0_bases[0]])
 
-            try:
-                # Extract metadata from the first channel file
-                original_metadata = metadata_service.extract_metadata(ch0_file)
+        for base_name in ch0_bases:
+            ch0_name = ch0_by_base[base_name]
 
-                # Read both channel images
-                img_ch0 = tifffile.imread(ch0_file)
-                img_ch1 = tifffile.imread(ch1_file)
+            # Find corresponding ch1 file
+            ch1_name = ch1_by_base.get(base_name)
 
-                # Ensure images have the same dimensions
-                if img_ch0.shape != img_ch1.shape:
-                    ui.error(f"    ❌ Channel dimensions don't match")
-                    continue
+            if ch1_name is None:
+                ui.info(f"  ⚠️  No matching ch1 file for {ch0_name}")
+                continue
 
-                # Create merged stack (single image format: (Y, X) -> merge to (C, Y, X))
-                merged_stack = np.stack([img_ch0, img_ch1], axis=0)
-                axes = 'CYX'
+            # Generate output filename following original pattern: Merged_MAX_z-stack_stitched_name.tif
+            output_name = f"Merged_MAX_z-stack_{base_name}.tif"
+            output_path = exp_output_dir / output_name
 
-                # Preserve original metadata and add axes info
-                original_metadata.imagej_metadata['axes'] = axes
+            # Outputs are written atomically, so an existing non-empty file is
+            # complete and can be kept when resuming an interrupted run
+            if output_path.is_file() and output_path.stat().st_size > 0:
+                ui.info(f"  ⏭️  Already merged: {output_name}")
+                results['merged_files'].append(str(output_path))
+                continue
 
-                # Generate output filename following original pattern: Merged_MAX_z-stack_stitched_name.tif
-                # Remove channel info from filename
-                base_name = ch0_file.name.replace('MAX_z-stack_', '').replace('_ch0.tif', '')
-                output_name = f"Merged_MAX_z-stack_{base_name}.tif"
-                output_path = exp_output_dir / output_name
+            pairs.append((exp_max_dir / ch0_name, exp_max_dir / ch1_name,
+                          output_path, folder_metadata))
 
-                # Save as ImageJ-compatible TIFF with preserved metadata
-                success = metadata_service.save_image_with_metadata(
-                    merged_stack, output_path, original_metadata
-                )
-
-                if not success:
-                    # Fallback to basic saving
-                    try:
-                        tifffile.imwrite(output_path, merged_stack, imagej=True,
-                                       compression='lzw')
-                    except (KeyError, ImportError):
-                        tifffile.imwrite(output_path, merged_stack, imagej=True)
+    if not pairs:
+        return results
 
+    if len(pairs) == 1:
+        outcomes = [_merge_max_projection_pair(*pairs[0])]
+    else:
+        with ProcessPoolExecutor(max_workers=min(os.cpu_count() or 1, len(pairs))) as pool:
+            outcomes = list(pool.map(_merge_max_projection_pair, *zip(*pairs), chunksize=4))
+
+    # Per-pair lines are batched, and dropped entirely for large runs where
+    # only failures and the final count are worth reading
+    verbose = len(pairs) < VERBOSE_PAIR_LIMIT
+    with BatchedUserInterface(ui) as batched_ui:
+        for (ch0_file, ch1_file, output_path, _), error in zip(pairs, outcomes):
+            if verbose:
+                batched_ui.info(f"  Merging: {ch0_file.name} + {ch1_file.name}")
+            if error is None:
                 results['merged_files'].append(str(output_path))
-                ui.info(f"    ✅ Created: {output_name}")
+                if verbose:
+                    batched_ui.info(f"    ✅ Created: {output_path.name}")
+            else:
+                batched_ui.error(f"    ❌ Error merging {ch0_file.name} + {ch1_file.name}: {error}")
+                results['errors'].append({'files': [str(ch0_file), str(ch1_file)], 'error': error})
 
-            except Exception as e:
-                ui.error(f"    ❌ Error: {e}")
-                results['errors'].append({'files': [str(ch0_file), str(ch1_file)], 'error': str(e)})
+    if not verbose:
+        ui.info(f"    ✅ Created {len(results['merged_files'])} merged files")
 
     return results
 
@@ -848,6 +1001,9 @@ def run_auto_image_preprocessing_workflow(ui: UserInterfacePort) -> None:
             json.dump(metadata, f, indent=2)
 
         ui.info(f"✅ Metadata saved to: {metadata_file}")
+
+        # Experiment folders below the input root, materialized once for reuse
+        sub_folders = tuple(k for k in metadata['folders'] if k != '.')
         ui.info("📊 Summary:")
         ui.info(f"  - Total folders: {metadata['summary']['total_folders']}")
         ui.info(f"  - Total files: {metadata['summary']['total_files']}")
@@ -856,22 +1012,18 @@ def run_auto_image_preprocessing_workflow(ui: UserInterfacePort) -> None:
 
         # Step 2: Analyze data characteristics
         ui.info("Step 2: Analyzing data characteristics...")
-        has_z_series = False
-        has_multichannel = False
-        has_tile_scan = False
-        has_time_series = False
-
-        for folder_data in metadata['folders'].values():
-            for group_data in folder_data['image_groups'].values():
-                dims = group_data['dimensions']
-                if dims['z_planes']['count'] > 1:
-                    has_z_series = True
-                if dims['channels']['count'] > 1:
-                    has_multichannel = True
-                if dims['tiles']['count'] > 1:
-                    has_tile_scan = True
-                if dims['timepoints']['count'] > 1:
-                    has_time_series = True
+        # Pull the four per-group counts out of the nested dicts once, then
+        # reduce each flag over the flat tuples
+        group_counts = [
+            (dims['z_planes']['count'], dims['channels']['count'],
+             dims['tiles']['count'], dims['timepoints']['count'])
+            for folder_data in metadata['folders'].values()
+            for dims in (g['dimensions'] for g in folder_data['image_groups'].values())
+        ]
+        has_z_series = any(z > 1 for z, _, _, _ in group_counts)
+        has_multichannel = any(c > 1 for _, c, _, _ in group_counts)
+        has_tile_scan = any(t > 1 for _, _, t, _ in group_counts)
+        has_time_series = any(p > 1 for _, _, _, p in group_counts)
 
         ui.info("  📊 Data characteristics:")
         ui.info(f"    - Z-series data: {'Yes' if has_z_series else 'No'}")
@@ -880,6 +1032,14 @@ def run_auto_image_preprocessing_workflow(ui: UserInterfacePort) -> None:
         ui.info(f"    - Tile scan data: {'Yes' if has_tile_scan else 'No'}")
         ui.info("")
 
+        # Nothing to stitch, stack, project or merge (e.g. an output directory
+        # was selected as input): skip directory setup and processing entirely
+        if not (has_z_series or has_multichannel or has_tile_scan or has_time_series):
+            ui.info("ℹ️  No processing needed - no z-series, multi-channel, tile-scan, or time-series data detected")
+            ui.info(f"📁 Metadata saved to: {output_dir}")
+            ui.info("")
+            return
+
         # Step 3: Create processing directories based on data characteristics
         ui.info("Step 3: Setting up processing directories...")
 
@@ -899,20 +1059,16 @@ def run_auto_image_preprocessing_workflow(ui: UserInterfacePort) -> None:
         if has_time_series:
             processing_dirs['time_lapse'] = output_dir / 'time_lapse'
 
-        # Create experiment subdirectories that mirror input structure
-        if processing_dirs:
-            for folder_rel in metadata['folders'].keys():
-                if folder_rel != '.':  # Skip root directory
-                    for proc_name, proc_dir in processing_dirs.items():
-                        exp_dir = proc_dir / folder_rel
-                        exp_dir.mkdir(parents=True, exist_ok=True)
-
-                        # Create experiment subdirectories
-                        pass
+        # Create experiment subdirectories that mirror input structure.
+        # Deduplicated and sorted so parents are created before children;
+        # on re-runs the cheaper isdir() check avoids mkdir + EEXIST
+        proc_dirs = tuple(processing_dirs.values())
+        exp_dirs = sorted({proc_dir / folder_rel for proc_dir in proc_dirs for folder_rel in sub_folders})
+        for exp_dir in exp_dirs:
+            if not exp_dir.is_dir():
+                exp_dir.mkdir(parents=True, exist_ok=True)
 
-            ui.info("✅ Processing directories created")
-        else:
-            ui.info("ℹ️  No processing needed - no z-series, multi-channel, tile-scan, or time-series data detected")
+        ui.info("✅ Processing directories created")
         ui.info("")
 
         total_outputs = 0
@@ -935,7 +1091,8 @@ def run_auto_image_preprocessing_workflow(ui: UserInterfacePort) -> None:
 
             # Create z-stacks from current source (stitched files if tile-scan, otherwise original)
             if 'z_stacks' in processing_dirs:
-                z_results = create_z_stacks_structured(current_source_dir, processing_dirs['z_stacks'], ui, metadata)
+                z_results = create_z_stacks_structured(current_source_dir, processing_dirs['z_stacks'], ui, metadata,
+                                                       is_stitched_input=has_tile_scan)
                 total_outputs += len(z_results['stacks_created'])
                 # Update source for next step
                 current_source_dir = processing_dirs['z_stacks']
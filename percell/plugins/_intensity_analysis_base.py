@@ -9,7 +9,10 @@ from __future__ import annotations
 
 import argparse
 import csv
+import importlib
+import os
 import zipfile
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 from typing import Optional, Dict, List
 
@@ -37,6 +40,14 @@ BASE_METADATA = PluginMetadata(
     menu_description="Analyze ROI intensities with local background subtraction using Gaussian peak detection"
 )
 
+# (module, pip package) pairs the analysis needs; matplotlib is optional
+ANALYSIS_DEPENDENCIES = (
+    ("PIL", "pillow"),
+    ("roifile", "roifile"),
+    ("scipy", "scipy"),
+    ("skimage", "scikit-image"),
+)
+
 
 class IntensityAnalysisBSPlugin(PerCellPlugin):
     """Intensity analysis plugin with background subtraction.
@@ -51,6 +62,20 @@ class IntensityAnalysisBSPlugin(PerCellPlugin):
         """Initialize plugin."""
         super().__init__(metadata or BASE_METADATA)
 
+    def _check_dependencies(self, ui: UserInterfacePort) -> bool:
+        """Import the analysis dependencies once, reporting any that are missing."""
+        missing = []
+        for module_name, package in ANALYSIS_DEPENDENCIES:
+            try:
+                importlib.import_module(module_name)
+            except ImportError:
+                missing.append(package)
+        if missing:
+            ui.error(f"Missing required packages: {', '.join(missing)}. "
+                     f"Install with: pip install {' '.join(missing)}")
+            return False
+        return True
+    
     def _is_dot_file(self, path: Path) -> bool:
         """Check if a file or directory is a dot file (hidden file starting with .)."""
         return path.name.startswith('.')
@@ -65,6 +90,10 @@ class IntensityAnalysisBSPlugin(PerCellPlugin):
             ui.info("🔬 Intensity Analysis with Background Subtraction")
             ui.info("=" * 60)
             
+            if not self._check_dependencies(ui):
+                ui.prompt("Press Enter to continue...")
+                return None
+            
             # Get base directory from args or prompt
             base_dir = getattr(args, 'input', None)
             if not base_dir:
@@ -91,7 +120,8 @@ class IntensityAnalysisBSPlugin(PerCellPlugin):
             analysis_configs = self._get_analysis_configurations()
             analysis_configs = self._prompt_for_config_parameters(ui, analysis_configs)
             
-            # Process each subdirectory
+            # Find the files for each dataset and configuration
+            jobs = []
             for data_dir in subdirs:
                 dataset_name = data_dir.name
                 method = "gaussian_peaks"  # Default method
@@ -146,47 +176,43 @@ class IntensityAnalysisBSPlugin(PerCellPlugin):
                     ui.info(f"  Mask ROIs: {mask_file.name}")
                     ui.info(f"  Dilated mask ROIs: {dilated_file.name}")
                     
-                    # Load intensity image
-                    intensity_image = self._load_image(str(intensity_file))
-                    image_shape = intensity_image.shape
-                    
-                    # Load ROI files
-                    mask_rois = self._load_imagej_rois(str(mask_file))
-                    dilated_rois = self._load_imagej_rois(str(dilated_file))
-                    
-                    # Optionally further enlarge the dilated ROIs
-                    if config['enlarge_rois'] > 0:
-                        background_rois = self._enlarge_rois_with_imagej(
-                            dilated_rois, pixels=config['enlarge_rois']
-                        )
-                    else:
-                        background_rois = dilated_rois
-                    
-                    # Analyze intensity using ROIs
-                    results = self._analyze_roi_intensity_from_rois(
-                        mask_rois, background_rois, intensity_image,
-                        image_shape, method=method,
-                        max_background=config['max_background']
-                    )
-                    
-                    # Print summary
-                    ui.info("\n  Summary Statistics (Intensity measurements):")
-                    backgrounds = [r['background'] for r in results['rois']]
-                    bg_subtracted = [r['mean_bg_subtracted'] for r in results['rois']]
-                    if len(backgrounds) > 0:
-                        ui.info(f"    Mean background: {np.mean(backgrounds):.2f}")
-                        ui.info(f"    Median background: {np.median(backgrounds):.2f}")
-                        ui.info(f"    ROIs with positive signal (>0): {np.sum(np.array(bg_subtracted) > 0)}/{len(bg_subtracted)}")
-                    
-                    # Create output filename
-                    output_name = f"{dataset_name}_{config['output_name']}"
-                    
-                    # Save results
-                    self._save_summary_statistics(results, data_dir, output_name, ui)
-                    self._visualize_roi_histograms(results, data_dir, output_name, ui)
+                    jobs.append((data_dir, config, (
+                        intensity_file, mask_file, dilated_file,
+                        config['enlarge_rois'], method, config['max_background']
+                    )))
                 
                 ui.info("")
             
+            # Pipeline the datasets: worker processes analyze them, this
+            # process prints and saves each result as soon as it arrives, and
+            # the histogram plots are handed back to the workers to render
+            if len(jobs) <= 1:
+                for data_dir, config, job_arg in jobs:
+                    self._report_dataset_results(
+                        ui, data_dir, config, self._analyze_dataset_files(*job_arg)
+                    )
+            else:
+                ui.info(f"Analyzing {len(jobs)} dataset configurations in parallel...")
+                job_args = [job_arg for _, _, job_arg in jobs]
+                with ProcessPoolExecutor(max_workers=min(os.cpu_count() or 1, len(jobs))) as pool:
+                    all_results = pool.map(_analyze_dataset_files, *zip(*job_args))
+                    plots = []
+                    for (data_dir, config, _), results in zip(jobs, all_results):
+                        output_name = self._report_dataset_results(
+                            ui, data_dir, config, results, visualize=False
+                        )
+                        plots.append(pool.submit(
+                            _render_roi_histograms, results, data_dir, output_name
+                        ))
+                    for plot in plots:
+                        try:
+                            output_path = plot.result()
+                        except ImportError:
+                            ui.info("  ⚠️  matplotlib not available, skipping visualization")
+                            break
+                        if output_path is not None:
+                            ui.info(f"  ✅ Saved: {output_path.name}")
+            
             ui.info("✅ Intensity analysis completed successfully!")
             ui.prompt("Press Enter to return to main menu...")
             
@@ -199,8 +225,74 @@ class IntensityAnalysisBSPlugin(PerCellPlugin):
             ui.prompt("Press Enter to continue...")
             return None
     
+    def _report_dataset_results(
+        self,
+        ui: UserInterfacePort,
+        data_dir: Path,
+        config: Dict,
+        results: Dict,
+        visualize: bool = True
+    ) -> str:
+        """Print summary statistics for one dataset configuration and save its outputs.
+        
+        Returns:
+            The output name used for the dataset's files
+        """
+        dataset_name = data_dir.name
+        
+        # Print summary
+        ui.info(f"\n  Summary Statistics for {dataset_name} {config['name']} (Intensity measurements):")
+        backgrounds = [r['background'] for r in results['rois']]
+        bg_subtracted = [r['mean_bg_subtracted'] for r in results['rois']]
+        if len(backgrounds) > 0:
+            ui.info(f"    Mean background: {np.mean(backgrounds):.2f}")
+            ui.info(f"    Median background: {np.median(backgrounds):.2f}")
+            ui.info(f"    ROIs with positive signal (>0): {np.sum(np.array(bg_subtracted) > 0)}/{len(bg_subtracted)}")
+        
+        # Create output filename
+        output_name = f"{dataset_name}_{config['output_name']}"
+        
+        # Save results
+        self._save_summary_statistics(results, data_dir, output_name, ui)
+        if visualize:
+            self._visualize_roi_histograms(results, data_dir, output_name, ui)
+        return output_name
+    
     # Helper methods from original script (adapted for plugin)
     
+    def _analyze_dataset_files(
+        self,
+        intensity_file: Path,
+        mask_file: Path,
+        dilated_file: Path,
+        enlarge_rois: int,
+        method: str,
+        max_background: Optional[float]
+    ) -> Dict:
+        """Load one dataset's intensity image and ROIs and analyze them."""
+        # Load intensity image
+        intensity_image = self._load_image(str(intensity_file))
+        image_shape = intensity_image.shape
+        
+        # Load ROI files
+        mask_rois = self._load_imagej_rois(str(mask_file))
+        dilated_rois = self._load_imagej_rois(str(dilated_file))
+        
+        # Optionally further enlarge the dilated ROIs
+        if enlarge_rois > 0:
+            background_rois = self._enlarge_rois_with_imagej(
+                dilated_rois, pixels=enlarge_rois
+            )
+        else:
+            background_rois = dilated_rois
+        
+        # Analyze intensity using ROIs
+        return self._analyze_roi_intensity_from_rois(
+            mask_rois, background_rois, intensity_image,
+            image_shape, method=method,
+            max_background=max_background
+        )
+    
     def _load_image(self, filepath: str) -> np.ndarray:
         """Load an image file and convert to numpy array."""
         try:
@@ -248,30 +340,17 @@ class IntensityAnalysisBSPlugin(PerCellPlugin):
                 max_y = max(max_y, int(np.max(coords[:, 1])))
         
         image_shape = (max_y + 100, max_x + 100)
+        structure = ndimage.generate_binary_structure(2, 1)
         enlarged_rois = []
         
         for roi_dict in rois:
-            mask = self._roi_to_mask(roi_dict['coordinates'], image_shape)
-            from scipy import ndimage
-            structure = ndimage.generate_binary_structure(2, 1)
-            
-            if pixels > 0:
-                enlarged_mask = ndimage.binary_dilation(
-                    mask, structure=structure, iterations=pixels
-                ).astype(np.uint8)
-            elif pixels < 0:
-                enlarged_mask = ndimage.binary_erosion(
-                    mask, structure=structure, iterations=abs(pixels)
-                ).astype(np.uint8)
-            else:
-                enlarged_mask = mask
-            
-            contours = find_contours(enlarged_mask, 0.5)
-            if len(contours) > 0:
-                largest_contour = max(contours, key=len)
-                new_coords = np.column_stack((largest_contour[:, 1], largest_contour[:, 0]))
+            coords = roi_dict['coordinates']
+            if len(coords) > 0:
+                new_coords = self._enlarge_roi_coordinates(
+                    coords, image_shape, pixels, structure
+                )
             else:
-                new_coords = roi_dict['coordinates']
+                new_coords = coords
             
             enlarged_rois.append({
                 'name': roi_dict['name'],
@@ -282,12 +361,57 @@ class IntensityAnalysisBSPlugin(PerCellPlugin):
         
         return enlarged_rois
     
+    def _enlarge_roi_coordinates(
+        self,
+        coords: np.ndarray,
+        image_shape: tuple,
+        pixels: int,
+        structure: np.ndarray
+    ) -> np.ndarray:
+        """Dilate or erode one ROI polygon and return its new outline.
+        
+        The work is done in the ROI's bounding box, padded so that dilation
+        never reaches the window edge, rather than on a full-image mask.
+        """
+        from scipy import ndimage
+        from skimage.measure import find_contours
+        
+        y0, y1, x0, x1 = self._roi_window(coords, image_shape, margin=max(pixels, 0) + 1)
+        mask = self._roi_to_mask(coords - (x0, y0), (y1 - y0, x1 - x0))
+        
+        if pixels > 0:
+            enlarged_mask = ndimage.binary_dilation(
+                mask, structure=structure, iterations=pixels
+            ).astype(np.uint8)
+        elif pixels < 0:
+            enlarged_mask = ndimage.binary_erosion(
+                mask, structure=structure, iterations=abs(pixels)
+            ).astype(np.uint8)
+        else:
+            enlarged_mask = mask
+        
+        contours = find_contours(enlarged_mask, 0.5)
+        if len(contours) == 0:
+            return coords
+        largest_contour = max(contours, key=len)
+        # (row, col) -> (x, y) and back to image coordinates in one contiguous allocation
+        return largest_contour[:, ::-1] + (x0, y0)
+    
+    def _roi_window(self, roi_coords: np.ndarray, image_shape: tuple, margin: int = 1) -> tuple:
+        """Return the (y0, y1, x0, x1) bounding box of ROI coordinates.
+        
+        The box is grown by *margin* pixels on each side and clipped to the image.
+        """
+        x0 = max(int(np.floor(roi_coords[:, 0].min())) - margin, 0)
+        y0 = max(int(np.floor(roi_coords[:, 1].min())) - margin, 0)
+        x1 = min(int(np.ceil(roi_coords[:, 0].max())) + margin + 1, image_shape[1])
+        y1 = min(int(np.ceil(roi_coords[:, 1].max())) + margin + 1, image_shape[0])
+        return y0, max(y1, y0), x0, max(x1, x0)
+    
     def _roi_to_mask(self, roi_coords: np.ndarray, image_shape: tuple) -> np.ndarray:
         """Convert ROI coordinates to a binary mask."""
-        try:
-            from skimage.draw import polygon
-        except ImportError:
-            raise ImportError("scikit-image package is required. Install with: pip install scikit-image")
+        # Called for every ROI; availability is checked once in execute()
+        from skimage.draw import polygon
         
         mask = np.zeros(image_shape, dtype=np.uint8)
         if len(roi_coords) > 0:
@@ -295,13 +419,23 @@ class IntensityAnalysisBSPlugin(PerCellPlugin):
             mask[rr, cc] = 1
         return mask
     
+    def _roi_pixels(self, roi_coords: np.ndarray, image: np.ndarray, image_shape: tuple) -> np.ndarray:
+        """Return the image pixels inside an ROI, rasterized within its bounding box only.
+        
+        Pixels come back in the same row-major order as indexing the full image
+        with a whole-image mask, without allocating one per ROI.
+        """
+        if len(roi_coords) == 0:
+            return image[:0, :0].ravel()
+        y0, y1, x0, x1 = self._roi_window(roi_coords, image_shape)
+        mask = self._roi_to_mask(roi_coords - (x0, y0), (y1 - y0, x1 - x0))
+        return image[y0:y1, x0:x1][mask > 0]
+    
     def _find_gaussian_peaks(self, data: np.ndarray, n_bins: int = 50, max_background: Optional[float] = None) -> Optional[Dict]:
         """Find Gaussian peaks in a histogram of the data."""
-        try:
-            from scipy.ndimage import gaussian_filter1d
-            from scipy.signal import find_peaks
-        except ImportError:
-            raise ImportError("scipy package is required. Install with: pip install scipy")
+        # Called for every ROI; availability is checked once in execute()
+        from scipy.ndimage import gaussian_filter1d
+        from scipy.signal import find_peaks
         
         if len(data) == 0:
             return None
@@ -380,11 +514,8 @@ class IntensityAnalysisBSPlugin(PerCellPlugin):
         results = []
         
         for i in range(n_rois):
-            roi_mask = self._roi_to_mask(mask_rois[i]['coordinates'], image_shape)
-            background_mask = self._roi_to_mask(perimeter_rois[i]['coordinates'], image_shape)
-            
-            roi_intensities = intensity_image[roi_mask > 0]
-            background_intensities = intensity_image[background_mask > 0]
+            roi_intensities = self._roi_pixels(mask_rois[i]['coordinates'], intensity_image, image_shape)
+            background_intensities = self._roi_pixels(perimeter_rois[i]['coordinates'], intensity_image, image_shape)
             
             if len(roi_intensities) == 0 or len(background_intensities) == 0:
                 continue
@@ -433,16 +564,31 @@ class IntensityAnalysisBSPlugin(PerCellPlugin):
     ) -> None:
         """Create histogram visualizations for ROIs."""
         try:
-            import matplotlib.pyplot as plt
+            output_path = self._render_roi_histograms(
+                analysis_results, data_dir, dataset_name, max_plots
+            )
         except ImportError:
-            ui.warning("matplotlib not available, skipping visualization")
+            ui.info("  ⚠️  matplotlib not available, skipping visualization")
             return
         
+        if output_path is not None:
+            ui.info(f"  ✅ Saved: {output_path.name}")
+    
+    def _render_roi_histograms(
+        self,
+        analysis_results: Dict,
+        data_dir: Path,
+        dataset_name: str,
+        max_plots: int = 9
+    ) -> Optional[Path]:
+        """Render the ROI histogram figure and return its path (None if there are no ROIs)."""
+        import matplotlib.pyplot as plt
+        
         rois = analysis_results['rois']
         n_to_plot = min(max_plots, len(rois))
         
         if n_to_plot == 0:
-            return
+            return None
         
         n_cols = 3
         n_rows = (n_to_plot + n_cols - 1) // n_cols
@@ -492,7 +638,7 @@ class IntensityAnalysisBSPlugin(PerCellPlugin):
         output_path = data_dir / f"{dataset_name}_background_histograms.png"
         plt.savefig(output_path, dpi=150, bbox_inches='tight')
         plt.close()
-        ui.info(f"  ✅ Saved: {output_path.name}")
+        return output_path
     
     def _save_summary_statistics(
         self,
@@ -639,3 +785,29 @@ class IntensityAnalysisBSPlugin(PerCellPlugin):
 
         return configs
 
+
+def _analyze_dataset_files(
+    intensity_file: Path,
+    mask_file: Path,
+    dilated_file: Path,
+    enlarge_rois: int,
+    method: str,
+    max_background: Optional[float]
+) -> Dict:
+    """Analyze one dataset configuration (module-level so worker processes can run it)."""
+    return IntensityAnalysisBSPlugin()._analyze_dataset_files(
+        intensity_file, mask_file, dilated_file, enlarge_rois, method, max_background
+    )
+
+
+def _render_roi_histograms(
+    analysis_results: Dict,
+    data_dir: Path,
+    dataset_name: str
+) -> Optional[Path]:
+    """Render one dataset's ROI histograms (module-level so worker processes can run it)."""
+    import matplotlib
+    matplotlib.use("Agg")  # Workers only write image files
+    return IntensityAnalysisBSPlugin()._render_roi_histograms(
+        analysis_results, data_dir, dataset_name
+    )
@@ -15,13 +15,18 @@ from typing import Any, Dict, Optional, List, Callable
 import json
 import importlib.util
 import inspect
+import sys
 
 from percell.ports.driving.user_interface_port import UserInterfacePort
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class PluginMetadata:
-    """Metadata describing a PerCell plugin."""
+    """Metadata describing a PerCell plugin.
+
+    Instances are immutable and the name is interned, since it keys every
+    registry lookup.
+    """
     
     name: str
     version: str
@@ -36,6 +41,10 @@ class PluginMetadata:
     menu_title: Optional[str] = None
     menu_description: Optional[str] = None
     
+    def __post_init__(self) -> None:
+        if isinstance(self.name, str):
+            object.__setattr__(self, "name", sys.intern(self.name))
+    
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> PluginMetadata:
         """Create PluginMetadata from dictionary."""
@@ -9,13 +9,127 @@ It analyzes the script and generates a plugin with proper integration.
 from __future__ import annotations
 
 import ast
+import json
+import os
 import re
+import string
 import sys
+import traceback
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 from typing import Dict, List, Optional, Set, Tuple
 import argparse
 
 
+# Words whose presence anywhere in a script suggests directory arguments
+_DIRECTORY_KEYWORDS = re.compile(r'input|output|directory', re.IGNORECASE)
+
+# Attribute calls recorded as file operations
+_FILE_OPERATIONS = frozenset({'open', 'read', 'write', 'mkdir', 'exists', 'glob', 'rglob'})
+
+# Script imports the generated plugin template already handles itself
+_SKIP_IMPORTS = frozenset({'argparse', 'sys', 'os'})
+
+def _write_atomic(path: Path, text: str) -> None:
+    """Write text via a sibling temp file so readers never see a partial file."""
+    tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    tmp_path.write_text(text)
+    os.replace(tmp_path, path)
+
+
+def _default_plugin_name(script_path: Path) -> str:
+    """Derive a plugin name from a script's filename."""
+    return script_path.stem.lower().replace(' ', '_')
+
+
+# Source of generated plugin modules; ${...} fields are filled by
+# PluginGenerator._generate_plugin_code
+_PLUGIN_TEMPLATE = string.Template('''"""
+${title} Plugin for PerCell
+
+Auto-generated from ${script_name}
+"""
+
+from __future__ import annotations
+
+import argparse
+from pathlib import Path
+from typing import Optional
+
+from percell.plugins.base import PerCellPlugin, PluginMetadata
+from percell.ports.driving.user_interface_port import UserInterfacePort
+
+# Original script imports
+${imports}
+
+# Plugin metadata
+METADATA = PluginMetadata(
+    name="${plugin_name}",
+    version="1.0.0",
+    description="Auto-generated plugin from ${script_name}",
+    author="Auto-generated",
+    requires_input_dir=${requires_input_dir},
+    requires_output_dir=${requires_output_dir},
+    requires_config=${requires_config},
+    category="converted",
+    menu_title="${menu_title}",
+    menu_description="Auto-generated from ${script_name}"
+)
+
+
+class ${class_name}Plugin(PerCellPlugin):
+    """Plugin generated from ${script_name}."""
+    
+    def __init__(self):
+        """Initialize plugin."""
+        super().__init__(METADATA)
+    
+    def execute(
+        self,
+        ui: UserInterfacePort,
+        args: argparse.Namespace
+    ) -> Optional[argparse.Namespace]:
+        """Execute the plugin."""
+        try:
+            # Get directories from args or prompt
+            input_dir = getattr(args, 'input', None)
+            output_dir = getattr(args, 'output', None)
+            
+            if self.metadata.requires_input_dir and not input_dir:
+                input_dir = ui.prompt("Enter input directory path: ").strip()
+                if not Path(input_dir).exists():
+                    ui.error(f"Input directory does not exist: {input_dir}")
+                    return args
+            
+            if self.metadata.requires_output_dir and not output_dir:
+                output_dir = ui.prompt("Enter output directory path: ").strip()
+                try:
+                    Path(output_dir).mkdir(parents=True, exist_ok=True)
+                except Exception as e:
+                    ui.error(f"Cannot create output directory: {e}")
+                    return args
+            
+            # Set directories in args for script compatibility
+            args.input = input_dir
+            args.output = output_dir
+            
+            # Execute main function
+            ${main_function_code}
+            
+            ui.info("\\nPlugin execution completed successfully!")
+            ui.prompt("Press Enter to return to main menu...")
+            
+            return args
+            
+        except Exception as e:
+            ui.error(f"Error executing plugin: {e}")
+            import traceback
+            ui.error(traceback.format_exc())
+            ui.prompt("Press Enter to continue...")
+            return args
+''')
+
+
 class ScriptAnalyzer(ast.NodeVisitor):
     """Analyzes Python scripts to extract information for plugin conversion."""
     
@@ -31,9 +145,13 @@ class ScriptAnalyzer(ast.NodeVisitor):
         self.requires_input_dir = False
         self.requires_output_dir = False
         self.requires_config = False
+        self._function_depth = 0
         
     def visit_Import(self, node: ast.Import) -> None:
-        """Visit import statements."""
+        """Visit module-level import statements."""
+        # Function-local imports (often guarded optional deps) stay out of the plugin
+        if self._function_depth:
+            return
         for alias in node.names:
             self.imports.add(alias.name)
             if alias.name == 'argparse':
@@ -42,7 +160,9 @@ class ScriptAnalyzer(ast.NodeVisitor):
                 self.has_pathlib = True
     
     def visit_ImportFrom(self, node: ast.ImportFrom) -> None:
-        """Visit from imports."""
+        """Visit module-level from imports."""
+        if self._function_depth:
+            return
         if node.module:
             self.imports.add(node.module)
             if node.module == 'argparse':
@@ -55,36 +175,72 @@ class ScriptAnalyzer(ast.NodeVisitor):
     
     def visit_FunctionDef(self, node: ast.FunctionDef) -> None:
         """Visit function definitions."""
-        self.functions.append((node.name, node))
+        # Nested functions are analyzed as part of their enclosing function
+        if not self._function_depth:
+            self.functions.append((node.name, node))
+            
+            # Check for main function patterns
+            if node.name == 'main' or node.name.startswith('run_') or node.name.endswith('_workflow'):
+                self.main_function = node
         
-        # Check for main function patterns
-        if node.name == 'main' or node.name.startswith('run_') or node.name.endswith('_workflow'):
-            self.main_function = node
+        if self._saturated():
+            # Every body pattern has been seen; nothing in the body can change
+            return
         
-        # Analyze function body for patterns
-        self._analyze_function_body(node)
+        # Analyze function body for patterns in the same traversal
+        self._function_depth += 1
+        self.generic_visit(node)
+        self._function_depth -= 1
     
-    def _analyze_function_body(self, node: ast.FunctionDef) -> None:
-        """Analyze function body for common patterns."""
-        for child in ast.walk(node):
-            # Check for file operations
-            if isinstance(child, ast.Call):
-                if isinstance(child.func, ast.Attribute):
-                    if child.func.attr in ('open', 'read', 'write', 'mkdir', 'exists', 'glob', 'rglob'):
-                        self.file_operations.add(child.func.attr)
-            
-            # Check for input/output directory patterns
-            if isinstance(child, ast.Str) or (isinstance(child, ast.Constant) and isinstance(child.value, str)):
-                value = child.value if isinstance(child, ast.Constant) else child.s
-                if 'input' in value.lower() and 'dir' in value.lower():
+    def visit_Call(self, node: ast.Call) -> None:
+        """Check calls inside functions for file operations."""
+        if self._function_depth and isinstance(node.func, ast.Attribute):
+            if node.func.attr in _FILE_OPERATIONS:
+                self.file_operations.add(node.func.attr)
+        self.generic_visit(node)
+    
+    def visit_Constant(self, node: ast.Constant) -> None:
+        """Check string constants inside functions for input/output directory patterns."""
+        if self._function_depth and isinstance(node.value, str):
+            value = node.value.lower()
+            if 'dir' in value:
+                if 'input' in value:
                     self.requires_input_dir = True
-                if 'output' in value.lower() and 'dir' in value.lower():
+                if 'output' in value:
                     self.requires_output_dir = True
-            
-            # Check for config patterns
-            if isinstance(child, ast.Name):
-                if child.id in ('config', 'configuration', 'settings'):
-                    self.requires_config = True
+    
+    def visit_Name(self, node: ast.Name) -> None:
+        """Check names inside functions for config patterns."""
+        if self._function_depth and node.id in ('config', 'configuration', 'settings'):
+            self.requires_config = True
+    
+    def _saturated(self) -> bool:
+        """Return True once function bodies can no longer change any flag."""
+        return (
+            self.requires_input_dir
+            and self.requires_output_dir
+            and self.requires_config
+            and len(self.file_operations) == len(_FILE_OPERATIONS)
+        )
+    
+    # Node type -> handler, looked up once per node instead of NodeVisitor's
+    # per-node 'visit_' + class name string build and getattr
+    _DISPATCH = {
+        ast.Import: visit_Import,
+        ast.ImportFrom: visit_ImportFrom,
+        ast.FunctionDef: visit_FunctionDef,
+        ast.Call: visit_Call,
+        ast.Constant: visit_Constant,
+        ast.Name: visit_Name,
+    }
+    
+    def visit(self, node: ast.AST) -> None:
+        """Visit a node through the dispatch table."""
+        handler = self._DISPATCH.get(type(node))
+        if handler is None:
+            self.generic_visit(node)
+        else:
+            handler(self, node)
 
 
 class PluginGenerator:
@@ -98,8 +254,9 @@ class PluginGenerator:
             plugin_name: Optional plugin name (derived from filename if not provided)
         """
         self.script_path = script_path
-        self.plugin_name = plugin_name or script_path.stem.lower().replace(' ', '_')
+        self.plugin_name = plugin_name or _default_plugin_name(script_path)
         self.analyzer = ScriptAnalyzer()
+        self._source: Optional[str] = None
     
     def analyze(self) -> ScriptAnalyzer:
         """Analyze the source script.
@@ -107,17 +264,24 @@ class PluginGenerator:
         Returns:
             ScriptAnalyzer instance with analysis results
         """
-        with open(self.script_path, 'r') as f:
-            source = f.read()
+        raw_source = self.script_path.read_bytes()
+        source = self._source = raw_source.decode()
         
-        tree = ast.parse(source)
+        tree = ast.parse(raw_source)
         self.analyzer.visit(tree)
         
-        # Additional heuristics
-        if 'input' in source.lower() and 'directory' in source.lower():
-            self.analyzer.requires_input_dir = True
-        if 'output' in source.lower() and 'directory' in source.lower():
-            self.analyzer.requires_output_dir = True
+        # Additional heuristics: one case-insensitive scan for the keywords,
+        # stopping as soon as all of them have been seen
+        found = set()
+        for match in _DIRECTORY_KEYWORDS.finditer(source):
+            found.add(match.group().lower())
+            if len(found) == 3:
+                break
+        if 'directory' in found:
+            if 'input' in found:
+                self.analyzer.requires_input_dir = True
+            if 'output' in found:
+                self.analyzer.requires_output_dir = True
         
         return self.analyzer
     
@@ -136,21 +300,18 @@ class PluginGenerator:
         # Analyze script
         analyzer = self.analyze()
         
-        # Generate plugin class
+        # Render both outputs before touching the filesystem
         plugin_code = self._generate_plugin_code(analyzer)
         plugin_file = output_dir / f"{self.plugin_name}.py"
         
-        with open(plugin_file, 'w') as f:
-            f.write(plugin_code)
-        
-        # Generate metadata
         metadata = self._generate_metadata(analyzer)
+        metadata_payload = json.dumps(metadata, indent=2)
         metadata_file = output_dir / self.plugin_name / "plugin.json"
-        metadata_file.parent.mkdir(parents=True, exist_ok=True)
+        if not metadata_file.parent.is_dir():
+            metadata_file.parent.mkdir(parents=True, exist_ok=True)
         
-        import json
-        with open(metadata_file, 'w') as f:
-            json.dump(metadata, f, indent=2)
+        _write_atomic(plugin_file, plugin_code)
+        _write_atomic(metadata_file, metadata_payload)
         
         return plugin_file, metadata_file
     
@@ -163,9 +324,8 @@ class PluginGenerator:
         Returns:
             Generated plugin code
         """
-        # Read original script
-        with open(self.script_path, 'r') as f:
-            original_code = f.read()
+        # Reuse the source read by analyze()
+        original_code = self._source
         
         # Extract main function or create wrapper
         main_function_code = self._extract_main_function(original_code, analyzer)
@@ -173,91 +333,21 @@ class PluginGenerator:
         # Generate imports
         imports = self._generate_imports(analyzer)
         
-        # Generate plugin class
-        plugin_class = f'''"""
-{self.plugin_name.title()} Plugin for PerCell
-
-Auto-generated from {self.script_path.name}
-"""
-
-from __future__ import annotations
-
-import argparse
-from pathlib import Path
-from typing import Optional
-
-from percell.plugins.base import PerCellPlugin, PluginMetadata
-from percell.ports.driving.user_interface_port import UserInterfacePort
-
-# Original script imports
-{imports}
-
-# Plugin metadata
-METADATA = PluginMetadata(
-    name="{self.plugin_name}",
-    version="1.0.0",
-    description="Auto-generated plugin from {self.script_path.name}",
-    author="Auto-generated",
-    requires_input_dir={str(analyzer.requires_input_dir).lower()},
-    requires_output_dir={str(analyzer.requires_output_dir).lower()},
-    requires_config={str(analyzer.requires_config).lower()},
-    category="converted",
-    menu_title="{self.plugin_name.replace('_', ' ').title()}",
-    menu_description="Auto-generated from {self.script_path.name}"
-)
-
-
-class {self.plugin_name.title().replace('_', '')}Plugin(PerCellPlugin):
-    """Plugin generated from {self.script_path.name}."""
-    
-    def __init__(self):
-        """Initialize plugin."""
-        super().__init__(METADATA)
-    
-    def execute(
-        self,
-        ui: UserInterfacePort,
-        args: argparse.Namespace
-    ) -> Optional[argparse.Namespace]:
-        """Execute the plugin."""
-        try:
-            # Get directories from args or prompt
-            input_dir = getattr(args, 'input', None)
-            output_dir = getattr(args, 'output', None)
-            
-            if self.metadata.requires_input_dir and not input_dir:
-                input_dir = ui.prompt("Enter input directory path: ").strip()
-                if not Path(input_dir).exists():
-                    ui.error(f"Input directory does not exist: {{input_dir}}")
-                    return args
-            
-            if self.metadata.requires_output_dir and not output_dir:
-                output_dir = ui.prompt("Enter output directory path: ").strip()
-                try:
-                    Path(output_dir).mkdir(parents=True, exist_ok=True)
-                except Exception as e:
-                    ui.error(f"Cannot create output directory: {{e}}")
-                    return args
-            
-            # Set directories in args for script compatibility
-            args.input = input_dir
-            args.output = output_dir
-            
-            # Execute main function
-            {main_function_code}
-            
-            ui.info("\\nPlugin execution completed successfully!")
-            ui.prompt("Press Enter to return to main menu...")
-            
-            return args
-            
-        except Exception as e:
-            ui.error(f"Error executing plugin: {{e}}")
-            import traceback
-            ui.error(traceback.format_exc())
-            ui.prompt("Press Enter to continue...")
-            return args
-'''
+        # Fill in the plugin class template
+        plugin_name = self.plugin_name
+        script_name = self.script_path.name
+        plugin_class = _PLUGIN_TEMPLATE.substitute(
+            title=plugin_name.title(),
+            script_name=script_name,
+            imports=imports,
+            plugin_name=plugin_name,
+            requires_input_dir=analyzer.requires_input_dir,
+            requires_output_dir=analyzer.requires_output_dir,
+            requires_config=analyzer.requires_config,
+            menu_title=plugin_name.replace('_', ' ').title(),
+            class_name=plugin_name.title().replace('_', ''),
+            main_function_code=main_function_code,
+        )
         
         return plugin_class
     
@@ -275,16 +365,16 @@ class {self.plugin_name.title().replace('_', '')}Plugin(PerCellPlugin):
             # Extract the main function body
             func_lines = original_code.split('\n')
             # This is simplified - in practice, you'd want to properly extract the function
-            return f"# Execute main function from original script\\n            # TODO: Integrate main function logic"
+            return f"# Execute main function from original script\n            # TODO: Integrate main function logic"
         
         # Look for if __name__ == '__main__' block
         if "__name__" in original_code and "__main__" in original_code:
-            return f"# Execute main block from original script\\n            # TODO: Integrate main block logic"
+            return f"# Execute main block from original script\n            # TODO: Integrate main block logic"
         
         # Default: try to call a function with common names
         for func_name, _ in analyzer.functions:
             if func_name in ('main', 'run', 'execute', 'process'):
-                return f"# Call {func_name} function\\n            # TODO: Call {func_name}(ui, args)"
+                return f"# Call {func_name} function\n            # TODO: Call {func_name}(ui, args)"
         
         return "# TODO: Integrate script logic here"
     
@@ -305,23 +395,25 @@ class {self.plugin_name.title().replace('_', '')}Plugin(PerCellPlugin):
             "from percell.domain.services.image_metadata_service import ImageMetadataService",
         ]
         
-        # Add based on detected usage
-        if 'numpy' in analyzer.imports or 'np' in str(analyzer.imports):
+        # Add based on detected usage (module names, so set membership suffices)
+        script_imports = analyzer.imports
+        if 'numpy' in script_imports:
             imports.append("import numpy as np")
-        if 'pandas' in analyzer.imports or 'pd' in str(analyzer.imports):
+        if 'pandas' in script_imports:
             imports.append("import pandas as pd")
-        if 'tifffile' in analyzer.imports:
+        if 'tifffile' in script_imports:
             imports.append("import tifffile")
-        if 'PIL' in analyzer.imports or 'Image' in str(analyzer.imports):
+        if any(name == 'PIL' or name.startswith('PIL.') for name in script_imports):
             imports.append("from PIL import Image")
         
         # Add original script imports (filtered)
-        for imp in sorted(analyzer.imports):
-            if not imp.startswith('percell'):
-                if imp not in ('argparse', 'sys', 'os'):  # These are handled separately
-                    imports.append(f"import {imp}")
+        filtered = {
+            imp for imp in script_imports - _SKIP_IMPORTS
+            if not imp.startswith('percell')
+        }
+        imports.extend(f"import {imp}" for imp in sorted(filtered))
         
-        return "\\n".join(imports) if imports else "# No additional imports needed"
+        return "\n".join(imports) if imports else "# No additional imports needed"
     
     def _generate_metadata(self, analyzer: ScriptAnalyzer) -> Dict:
         """Generate plugin metadata.
@@ -374,12 +466,13 @@ def main():
     parser.add_argument(
         "script",
         type=Path,
-        help="Path to Python script to convert"
+        nargs="+",
+        help="Path(s) to Python script(s) to convert"
     )
     parser.add_argument(
         "--name",
         type=str,
-        help="Plugin name (defaults to script filename)"
+        help="Plugin name (defaults to script filename, single script only)"
     )
     parser.add_argument(
         "--output",
@@ -389,27 +482,59 @@ def main():
     
     args = parser.parse_args()
     
-    if not args.script.exists():
-        print(f"Error: Script not found: {args.script}")
+    if args.name and len(args.script) > 1:
+        print("Error: --name can only be used when converting a single script")
         return 1
     
-    try:
-        plugin_file, metadata_file = convert_script(
-            args.script,
-            args.name,
-            args.output
-        )
+    missing = [script for script in args.script if not script.exists()]
+    for script in missing:
+        print(f"Error: Script not found: {script}")
+    if missing:
+        return 1
+    
+    # Scripts that map to the same plugin would overwrite each other's output
+    seen: Dict[str, Path] = {}
+    duplicates = False
+    for script in args.script:
+        name = args.name or _default_plugin_name(script)
+        if name in seen:
+            print(f"Error: {script} and {seen[name]} both convert to plugin '{name}'")
+            duplicates = True
+        else:
+            seen[name] = script
+    if duplicates:
+        return 1
+    
+    if len(args.script) == 1:
+        try:
+            results = [convert_script(args.script[0], args.name, args.output)]
+        except Exception as e:
+            print(f"Error: {e}")
+            traceback.print_exc()
+            return 1
+    else:
+        # Each conversion is an independent, CPU-bound parse and render
+        results = []
+        workers = min(os.cpu_count() or 1, len(args.script))
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = {
+                pool.submit(convert_script, script, None, args.output): script
+                for script in args.script
+            }
+            for future, script in futures.items():
+                try:
+                    results.append(future.result())
+                except Exception as e:
+                    print(f"Error converting {script}: {e}")
+        if len(results) < len(args.script):
+            return 1
+    
+    for plugin_file, metadata_file in results:
         print(f"✅ Generated plugin: {plugin_file}")
         print(f"✅ Generated metadata: {metadata_file}")
-        print(f"\\n⚠️  Note: You may need to manually integrate the script logic into the plugin.")
-        return 0
-    except Exception as e:
-        print(f"Error: {e}")
-        import traceback
-        traceback.print_exc()
-        return 1
+    print(f"\n⚠️  Note: You may need to manually integrate the script logic into the plugin.")
+    return 0
 
 
 if __name__ == "__main__":
     sys.exit(main())
-
@@ -11,15 +11,17 @@ This plugin integrates the 4-script preprocessing workflow into the intensity an
 from __future__ import annotations
 
 import argparse
+import os
+import traceback
 from pathlib import Path
 from typing import Optional
 
 from percell.plugins._intensity_analysis_base import IntensityAnalysisBSPlugin, BASE_METADATA
 from percell.plugins.base import PluginMetadata
 from percell.ports.driving.user_interface_port import UserInterfacePort
-from percell.domain.services.bs_preprocessing_service import BSPreprocessingService
-from percell.application.bs_workflow import BSWorkflow
-from percell.domain.services.package_resource_service import PackageResourceService
+
+# The preprocessing services and workflow are imported where they are used so
+# that registry discovery only pays for the plugin metadata
 
 # Enhanced plugin metadata
 # Name starts with "m_" to sort after auto plugins, appearing as option 3 in menu
@@ -41,6 +43,15 @@ _PLUGIN_METADATA = PluginMetadata(
 METADATA = _PLUGIN_METADATA
 
 
+def _first_attr(obj: object, *names: str, default=None):
+    """Return the first truthy attribute of obj among names, else default."""
+    for name in names:
+        value = getattr(obj, name, None)
+        if value:
+            return value
+    return default
+
+
 class IntensityAnalysisBSAutoPlugin(IntensityAnalysisBSPlugin):
     """Enhanced intensity analysis plugin with automatic preprocessing."""
 
@@ -50,18 +61,27 @@ class IntensityAnalysisBSAutoPlugin(IntensityAnalysisBSPlugin):
     # Override parent's internal marker - this is NOT an internal base class
     _INTERNAL_BASE_CLASS = False
 
+    # PackageResourceService only holds the package root, so one instance is
+    # shared by every plugin instance
+    _shared_resource_service = None
+
     def __init__(self, metadata: Optional[PluginMetadata] = None):
         """Initialize plugin."""
         if metadata is None:
             metadata = _PLUGIN_METADATA
         super().__init__(metadata)
-        self._preprocessing_service = BSPreprocessingService()
+        self._resource_service = self._package_resource_service()
+
+    @classmethod
+    def _package_resource_service(cls):
+        """Return the resource service rooted at the percell package."""
+        if cls._shared_resource_service is None:
+            import percell
+            from percell.domain.services.package_resource_service import PackageResourceService
 
-        # Initialize resource service with percell package root
-        import percell
-        from pathlib import Path
-        package_root = Path(percell.__file__).parent
-        self._resource_service = PackageResourceService(package_root=package_root)
+            package_root = Path(percell.__file__).parent
+            cls._shared_resource_service = PackageResourceService(package_root=package_root)
+        return cls._shared_resource_service
 
     def execute(
         self,
@@ -81,7 +101,7 @@ class IntensityAnalysisBSAutoPlugin(IntensityAnalysisBSPlugin):
 
             # Get percell analysis directory - prefer output over input
             # The output directory is where combined_masks/ and raw_data/ are created
-            percell_dir = getattr(args, 'output', None) or getattr(args, 'input', None)
+            percell_dir = _first_attr(args, 'output', 'input')
 
             if not percell_dir:
                 ui.info("\n📁 Select percell analysis OUTPUT directory")
@@ -90,20 +110,24 @@ class IntensityAnalysisBSAutoPlugin(IntensityAnalysisBSPlugin):
                 percell_dir = ui.prompt("Enter percell analysis output directory path: ").strip()
 
             percell_path = Path(percell_dir)
-            if not percell_path.exists():
+            # One directory listing answers all three existence checks
+            try:
+                with os.scandir(percell_path) as entries:
+                    subdirs = {entry.name for entry in entries if entry.is_dir()}
+            except (FileNotFoundError, NotADirectoryError):
                 ui.error(f"Error: Directory '{percell_dir}' does not exist")
                 ui.prompt("Press Enter to continue...")
                 return None
 
             # Validate percell directory structure
-            if not (percell_path / "combined_masks").exists():
+            if "combined_masks" not in subdirs:
                 ui.error(f"Error: {percell_path} does not contain combined_masks/ directory")
                 ui.error("This should be the percell OUTPUT directory (where analysis results are saved)")
                 ui.error("Not the INPUT directory (where raw images are located)")
                 ui.prompt("Press Enter to continue...")
                 return None
 
-            if not (percell_path / "raw_data").exists():
+            if "raw_data" not in subdirs:
                 ui.error(f"Error: {percell_path} does not contain raw_data/ directory")
                 ui.error("This should be the percell OUTPUT directory (where analysis results are saved)")
                 ui.error("Not the INPUT directory (where raw images are located)")
@@ -113,6 +137,7 @@ class IntensityAnalysisBSAutoPlugin(IntensityAnalysisBSPlugin):
             # Get ImageJ adapter from container
             try:
                 imagej_adapter = self.container.imagej
+                file_manager = self.container.fs
             except (RuntimeError, AttributeError) as e:
                 ui.error("Error: ImageJ adapter not available")
                 ui.error("Please ensure ImageJ is configured in your settings")
@@ -121,8 +146,10 @@ class IntensityAnalysisBSAutoPlugin(IntensityAnalysisBSPlugin):
                 return None
 
             # Create BS workflow orchestrator
+            from percell.application.bs_workflow import BSWorkflow
+            from percell.domain.services.bs_preprocessing_service import BSPreprocessingService
             workflow = BSWorkflow(
-                self._preprocessing_service,
+                BSPreprocessingService(file_manager=file_manager),
                 imagej_adapter,
                 self._resource_service
             )
@@ -147,7 +174,6 @@ class IntensityAnalysisBSAutoPlugin(IntensityAnalysisBSPlugin):
                 ui.info(f"✅ Preprocessing complete! Output: {bs_dir}")
             except Exception as e:
                 ui.error(f"❌ Preprocessing failed: {e}")
-                import traceback
                 ui.error(traceback.format_exc())
                 ui.prompt("Press Enter to continue...")
                 return None
@@ -168,7 +194,6 @@ class IntensityAnalysisBSAutoPlugin(IntensityAnalysisBSPlugin):
 
         except Exception as e:
             ui.error(f"Error executing plugin: {e}")
-            import traceback
             ui.error(traceback.format_exc())
             ui.prompt("Press Enter to continue...")
             return None
@@ -6,17 +6,108 @@ This module provides plugin discovery, registration, and management.
 
 from __future__ import annotations
 
+import ast
+import hashlib
 import importlib.util
 import json
 import logging
+import os
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Dict, List, Optional, Type, Any
-import inspect
+from types import FunctionType, ModuleType
+from typing import Dict, List, Optional, Tuple, Type, Union, Any
 
 from percell.plugins.base import PerCellPlugin, PluginMetadata, LegacyPluginAdapter
 
 logger = logging.getLogger(__name__)
 
+# Upper bound on threads used to import plugin modules during discovery
+DISCOVERY_WORKERS = 8
+
+# Discovery results are cached per user and per plugin directory, and reused
+# while no Python file in the directory has changed
+_PLUGIN_CACHE_VERSION = 1
+
+
+def _plugin_cache_path(plugin_dir: Path) -> Path:
+    """Return the per-user discovery cache file for *plugin_dir*.
+    
+    The cache lives outside the plugin directory, which may be read-only
+    (site-packages) or a source checkout.
+    """
+    key = hashlib.sha1(str(Path(plugin_dir).resolve()).encode()).hexdigest()[:16]
+    return Path.home() / ".cache" / "percell" / f"plugin_cache_{key}.json"
+
+
+def _plugin_candidate_names(plugin_file: Path) -> List[str]:
+    """Return names in a plugin file that look like plugins, without importing it.
+    
+    Candidates are classes with a base whose name ends in "Plugin",
+    show_*_plugin functions and imported *Plugin names. The scan is a
+    heuristic (a plugin may subclass an intermediate base of any name), so
+    discovery uses it only to decide which files to import first.
+    
+    Args:
+        plugin_file: Path to plugin Python file
+        
+    Returns:
+        Candidate names; empty if none were found or the file cannot be parsed
+    """
+    try:
+        with open(plugin_file, 'rb') as f:
+            tree = ast.parse(f.read(), str(plugin_file))
+    except (OSError, SyntaxError, ValueError):
+        return []
+    
+    names = []
+    for node in ast.walk(tree):
+        if isinstance(node, ast.ClassDef):
+            for base in node.bases:
+                base_name = base.id if isinstance(base, ast.Name) else getattr(base, 'attr', '')
+                if base_name.endswith("Plugin"):
+                    names.append(node.name)
+                    break
+        elif isinstance(node, ast.FunctionDef):
+            if node.name.startswith("show_") and node.name.endswith("_plugin"):
+                names.append(node.name)
+        elif isinstance(node, ast.ImportFrom):
+            for alias in node.names:
+                if alias.name.endswith("Plugin") and alias.name != "PerCellPlugin":
+                    names.append(alias.asname or alias.name)
+    return names
+
+
+class _LazyPluginClass:
+    """Stand-in for a cached plugin class that imports its module on first use."""
+    
+    def __init__(self, module_path: Path, class_name: str):
+        """Initialize lazy class reference.
+        
+        Args:
+            module_path: Path to the plugin module defining the class
+            class_name: Name of the plugin class in that module
+        """
+        self.module_path = module_path
+        self.class_name = class_name
+        self.__name__ = class_name
+        self._plugin_class: Optional[Type[PerCellPlugin]] = None
+    
+    def load(self) -> Type[PerCellPlugin]:
+        """Import the module and return the real plugin class."""
+        if self._plugin_class is None:
+            spec = importlib.util.spec_from_file_location(
+                self.module_path.stem,
+                self.module_path
+            )
+            module = importlib.util.module_from_spec(spec)
+            spec.loader.exec_module(module)
+            self._plugin_class = getattr(module, self.class_name)
+        return self._plugin_class
+    
+    def __call__(self, *args, **kwargs) -> PerCellPlugin:
+        """Instantiate the real plugin class."""
+        return self.load()(*args, **kwargs)
+
 
 class PluginRegistry:
     """Registry for managing PerCell plugins."""
@@ -24,8 +115,12 @@ class PluginRegistry:
     def __init__(self):
         """Initialize plugin registry."""
         self._plugins: Dict[str, PerCellPlugin] = {}
-        self._plugin_classes: Dict[str, Type[PerCellPlugin]] = {}
+        # Classes served from the discovery cache are _LazyPluginClass
+        # stand-ins, which instantiate like the class they refer to
+        self._plugin_classes: Dict[str, Union[Type[PerCellPlugin], _LazyPluginClass]] = {}
         self._metadata: Dict[str, PluginMetadata] = {}
+        # Memoized get_all_plugins() result, reset whenever a plugin is registered
+        self._all_plugins: Optional[List[PerCellPlugin]] = None
     
     def register(
         self,
@@ -41,17 +136,18 @@ class PluginRegistry:
         metadata = metadata or plugin.metadata
         self._plugins[metadata.name] = plugin
         self._metadata[metadata.name] = metadata
+        self._all_plugins = None
         logger.info(f"Registered plugin: {metadata.name} v{metadata.version}")
     
     def register_class(
         self,
-        plugin_class: Type[PerCellPlugin],
+        plugin_class: Union[Type[PerCellPlugin], _LazyPluginClass],
         metadata: Optional[PluginMetadata] = None
     ) -> None:
         """Register a plugin class (lazy instantiation).
         
         Args:
-            plugin_class: Plugin class to register
+            plugin_class: Plugin class, or a _LazyPluginClass stand-in, to register
             metadata: Optional metadata (will be extracted from class if not provided)
         """
         if metadata is None:
@@ -72,6 +168,7 @@ class PluginRegistry:
         
         self._plugin_classes[metadata.name] = plugin_class
         self._metadata[metadata.name] = metadata
+        self._all_plugins = None
         logger.info(f"Registered plugin class: {metadata.name}")
     
     def register_legacy_function(
@@ -117,12 +214,19 @@ class PluginRegistry:
         Returns:
             List of all plugin instances
         """
-        plugins = []
-        for name in self._metadata.keys():
-            plugin = self.get_plugin(name)
-            if plugin:
-                plugins.append(plugin)
-        return plugins
+        if self._all_plugins is None:
+            plugins = []
+            for name, metadata in self._metadata.items():
+                plugin = self._plugins.get(name)
+                if plugin is None:
+                    plugin_class = self._plugin_classes.get(name)
+                    if plugin_class is not None:
+                        plugin = plugin_class(metadata)
+                        self._plugins[name] = plugin
+                if plugin:
+                    plugins.append(plugin)
+            self._all_plugins = plugins
+        return list(self._all_plugins)
     
     def get_plugin_names(self) -> List[str]:
         """Get names of all registered plugins.
@@ -154,18 +258,62 @@ class PluginRegistry:
         
         logger.info(f"Discovering plugins in {plugin_dir}")
         
-        # Find all Python files in plugin directory
-        for plugin_file in plugin_dir.glob("*.py"):
-            if plugin_file.name.startswith("_") or plugin_file.name == "base.py" or plugin_file.name == "registry.py":
+        # Find all Python files and plugin.json files in one directory read
+        python_files, plugin_jsons, fingerprint = self._scan_plugin_dir(plugin_dir)
+        plugin_files = [
+            plugin_file for plugin_file in python_files
+            if not (plugin_file.name.startswith("_") or plugin_file.name == "base.py" or plugin_file.name == "registry.py")
+        ]
+        
+        cached = self._read_discovery_cache(plugin_dir, fingerprint)
+        to_import = [f for f in plugin_files if cached is None or f.name not in cached]
+        
+        # Files that look like plugins start importing first; the rest are
+        # still imported, as the AST scan cannot rule a file out
+        to_import.sort(key=lambda f: not _plugin_candidate_names(f))
+        
+        # Import modules concurrently, then register on this thread in file
+        # order so the registry contents do not depend on thread scheduling
+        futures = {}
+        if to_import:
+            workers = max(1, min(DISCOVERY_WORKERS, os.cpu_count() or 1, len(to_import)))
+            with ThreadPoolExecutor(max_workers=workers) as pool:
+                futures = {f: pool.submit(self._exec_plugin_module, f) for f in to_import}
+        
+        discovered: Dict[str, List[List[Any]]] = {}
+        for plugin_file in plugin_files:
+            if plugin_file not in futures:
+                for class_name, metadata_dict in cached[plugin_file.name]:
+                    self.register_class(
+                        _LazyPluginClass(plugin_file, class_name),
+                        PluginMetadata.from_dict(metadata_dict)
+                    )
                 continue
             
             try:
-                self._load_plugin_from_file(plugin_file)
+                try:
+                    module = futures[plugin_file].result()
+                except ImportError as e:
+                    module = None
+                    self._discover_after_import_error(plugin_file, e)
+                except RuntimeError as e:
+                    # Concurrent imports can collide on module locks; retry a
+                    # module-lock deadlock on this thread
+                    if "deadlock" not in str(e):
+                        raise
+                    module = self._import_plugin_module(plugin_file)
+                if module is not None:
+                    entries = self._register_module_plugins(module)
+                    if entries is not None:
+                        discovered[plugin_file.name] = entries
             except Exception as e:
                 logger.warning(f"Failed to load plugin from {plugin_file}: {e}")
         
-        # Find plugin.json files (for plugins with metadata)
-        for plugin_json in plugin_dir.glob("*/plugin.json"):
+        if cached is None:
+            self._write_discovery_cache(plugin_dir, fingerprint, discovered)
+        
+        # Load plugin.json files (for plugins with metadata)
+        for plugin_json in plugin_jsons:
             try:
                 self._load_plugin_from_json(plugin_json)
             except Exception as e:
@@ -177,44 +325,94 @@ class PluginRegistry:
         Args:
             plugin_file: Path to plugin Python file
         """
+        module = self._import_plugin_module(plugin_file)
+        if module is not None:
+            self._register_module_plugins(module)
+    
+    def _exec_plugin_module(self, plugin_file: Path) -> Optional[ModuleType]:
+        """Import a plugin file as a module, propagating any import failure.
+        
+        Args:
+            plugin_file: Path to plugin Python file
+            
+        Returns:
+            Executed module, or None if no loader is available for the file
+        """
         spec = importlib.util.spec_from_file_location(
             plugin_file.stem,
             plugin_file
         )
         if spec is None or spec.loader is None:
-            return
+            return None
         
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+        return module
+    
+    def _import_plugin_module(self, plugin_file: Path) -> Optional[ModuleType]:
+        """Import a plugin file, falling back to AST discovery on import errors.
+        
+        Args:
+            plugin_file: Path to plugin Python file
+            
+        Returns:
+            Executed module, or None if it could not be imported
+        """
         try:
-            module = importlib.util.module_from_spec(spec)
-            spec.loader.exec_module(module)
+            return self._exec_plugin_module(plugin_file)
         except ImportError as e:
-            # If it's a missing dependency, try to still discover the plugin class
-            # by parsing the file directly (simpler AST-based approach)
-            logger.warning(f"Import error loading {plugin_file}: {e}")
-            logger.info(f"Attempting AST-based discovery for {plugin_file}")
-            try:
-                self._discover_plugin_from_ast(plugin_file)
-            except Exception as ast_error:
-                logger.warning(f"AST-based discovery also failed: {ast_error}")
-            return
+            self._discover_after_import_error(plugin_file, e)
+            return None
         except Exception as e:
             logger.warning(f"Failed to load plugin from {plugin_file}: {e}")
-            return
+            return None
+    
+    def _discover_after_import_error(self, plugin_file: Path, error: ImportError) -> None:
+        """Log an import failure and fall back to AST-based discovery.
+        
+        Args:
+            plugin_file: Path to plugin Python file
+            error: Import error raised while executing the file
+        """
+        # If it's a missing dependency, try to still discover the plugin class
+        # by parsing the file directly (simpler AST-based approach)
+        logger.warning(f"Import error loading {plugin_file}: {error}")
+        logger.info(f"Attempting AST-based discovery for {plugin_file}")
+        try:
+            self._discover_plugin_from_ast(plugin_file)
+        except Exception as ast_error:
+            logger.warning(f"AST-based discovery also failed: {ast_error}")
+    
+    def _register_module_plugins(self, module: ModuleType) -> Optional[List[List[Any]]]:
+        """Register the plugin classes and legacy functions a module defines.
         
-        # Look for plugin classes
-        for name, obj in inspect.getmembers(module):
-            if (inspect.isclass(obj) and
-                issubclass(obj, PerCellPlugin) and
-                obj is not PerCellPlugin):
+        Args:
+            module: Executed plugin module
+            
+        Returns:
+            [class_name, metadata_dict] pairs for the registered classes, or
+            None if the module registered anything that cannot be cached
+        """
+        entries: Optional[List[List[Any]]] = []
+        
+        # One pass over the module namespace finds both plugin classes and
+        # legacy plugin functions
+        for name, obj in list(vars(module).items()):
+            if isinstance(obj, type):
+                if not issubclass(obj, PerCellPlugin) or obj is PerCellPlugin:
+                    continue
                 # Skip internal base classes marked with _INTERNAL_BASE_CLASS
-                if hasattr(obj, '_INTERNAL_BASE_CLASS') and obj._INTERNAL_BASE_CLASS:
+                if getattr(obj, '_INTERNAL_BASE_CLASS', False):
                     logger.debug(f"Skipping internal base class: {name}")
                     continue
 
                 # Check if it has METADATA attribute
                 if hasattr(obj, 'METADATA'):
                     self.register_class(obj, obj.METADATA)
+                    if entries is not None:
+                        entries.append([name, obj.METADATA.to_dict()])
                 else:
+                    entries = None
                     # Try to instantiate to get metadata
                     try:
                         # Create temporary metadata to instantiate
@@ -228,12 +426,11 @@ class PluginRegistry:
                         self.register(instance)
                     except Exception as e:
                         logger.warning(f"Could not instantiate {name}: {e}")
-        
-        # Look for legacy plugin functions (show_*_plugin pattern)
-        for name, obj in inspect.getmembers(module):
-            if (inspect.isfunction(obj) and 
-                name.startswith("show_") and 
-                name.endswith("_plugin")):
+            
+            # Legacy plugin functions (show_*_plugin pattern)
+            elif (isinstance(obj, FunctionType) and
+                  name.startswith("show_") and
+                  name.endswith("_plugin")):
                 plugin_name = name.replace("show_", "").replace("_plugin", "")
                 metadata = PluginMetadata(
                     name=plugin_name,
@@ -242,6 +439,100 @@ class PluginRegistry:
                     author="Unknown"
                 )
                 self.register_legacy_function(obj, metadata)
+                entries = None
+        
+        return entries
+    
+    def _scan_plugin_dir(
+        self,
+        plugin_dir: Path
+    ) -> Tuple[List[Path], List[Path], Dict[str, List[int]]]:
+        """List plugin sources, plugin.json files and the cache fingerprint.
+        
+        The fingerprint records the mtime and size of every Python file,
+        including helper modules, because plugin metadata may be built from
+        them (e.g. shared base metadata). Hidden entries are skipped, as glob
+        would skip them.
+        
+        Args:
+            plugin_dir: Plugin directory
+            
+        Returns:
+            Tuple of (sorted Python files, sorted <subdir>/plugin.json files,
+            mapping of Python file name to [st_mtime_ns, st_size])
+        """
+        python_files = []
+        plugin_jsons = []
+        fingerprint = {}
+        with os.scandir(plugin_dir) as entries:
+            for entry in entries:
+                if entry.name.startswith("."):
+                    continue
+                if entry.name.endswith(".py") and entry.is_file():
+                    stat = entry.stat()
+                    fingerprint[entry.name] = [stat.st_mtime_ns, stat.st_size]
+                    python_files.append(Path(entry.path))
+                elif entry.is_dir():
+                    plugin_json = Path(entry.path) / "plugin.json"
+                    if plugin_json.is_file():
+                        plugin_jsons.append(plugin_json)
+        return sorted(python_files), sorted(plugin_jsons), fingerprint
+    
+    def _read_discovery_cache(
+        self,
+        plugin_dir: Path,
+        fingerprint: Dict[str, List[int]]
+    ) -> Optional[Dict[str, List[List[Any]]]]:
+        """Load cached discovery results if they match the current files.
+        
+        Args:
+            plugin_dir: Plugin directory
+            fingerprint: Current fingerprint of the plugin directory
+            
+        Returns:
+            Mapping of file name to cached class entries, or None on a miss
+        """
+        try:
+            with open(_plugin_cache_path(plugin_dir), 'r') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return None
+        
+        if data.get("version") != _PLUGIN_CACHE_VERSION or data.get("fingerprint") != fingerprint:
+            return None
+        return data.get("plugins")
+    
+    def _write_discovery_cache(
+        self,
+        plugin_dir: Path,
+        fingerprint: Dict[str, List[int]],
+        plugins: Dict[str, List[List[Any]]]
+    ) -> None:
+        """Atomically write discovery results; failures only disable caching.
+        
+        Args:
+            plugin_dir: Plugin directory
+            fingerprint: Fingerprint the results were computed for
+            plugins: Mapping of file name to class entries
+        """
+        cache_file = _plugin_cache_path(plugin_dir)
+        tmp_file = cache_file.with_name(f"{cache_file.name}.{os.getpid()}.tmp")
+        data = {
+            "version": _PLUGIN_CACHE_VERSION,
+            "fingerprint": fingerprint,
+            "plugins": plugins,
+        }
+        try:
+            cache_file.parent.mkdir(parents=True, exist_ok=True)
+            with open(tmp_file, 'w') as f:
+                json.dump(data, f)
+            os.replace(tmp_file, cache_file)
+        except (OSError, TypeError, ValueError) as e:
+            logger.debug(f"Could not write plugin cache {cache_file}: {e}")
+            try:
+                tmp_file.unlink()
+            except OSError:
+                pass
     
     def _load_plugin_from_json(self, plugin_json: Path) -> None:
         """Load plugin from plugin.json file.
@@ -270,18 +561,22 @@ class PluginRegistry:
             
             # Look for plugin class with matching name
             plugin_class_name = f"{metadata.name.title().replace('_', '')}Plugin"
-            if hasattr(module, plugin_class_name):
-                plugin_class = getattr(module, plugin_class_name)
-                if issubclass(plugin_class, PerCellPlugin):
+            namespace = vars(module)
+            if plugin_class_name in namespace:
+                plugin_class = namespace[plugin_class_name]
+                if isinstance(plugin_class, type) and issubclass(plugin_class, PerCellPlugin):
                     self.register_class(plugin_class, metadata)
             else:
                 # Look for any PerCellPlugin subclass
-                for name, obj in inspect.getmembers(module):
-                    if (inspect.isclass(obj) and 
-                        issubclass(obj, PerCellPlugin) and 
-                        obj is not PerCellPlugin):
-                        self.register_class(obj, metadata)
-                        break
+                plugin_class = next(
+                    (obj for obj in namespace.values()
+                     if isinstance(obj, type) and
+                     issubclass(obj, PerCellPlugin) and
+                     obj is not PerCellPlugin),
+                    None,
+                )
+                if plugin_class is not None:
+                    self.register_class(plugin_class, metadata)
     
     def _discover_plugin_from_ast(self, plugin_file: Path) -> None:
         """Discover plugin class from AST without importing module.
@@ -1,7 +1,7 @@
 from __future__ import annotations
 
 from pathlib import Path
-from typing import Protocol, List
+from typing import Protocol, List, Tuple
 
 
 class FileManagementPort(Protocol):
@@ -13,6 +13,10 @@ class FileManagementPort(Protocol):
     def copy(self, src: Path, dst: Path, overwrite: bool = False) -> None:
         ...
 
+    def copy_many(self, pairs: List[Tuple[Path, Path]], overwrite: bool = False) -> None:
+        """Copy each (src, dst) pair; implementations may copy concurrently."""
+        ...
+
     def move(self, src: Path, dst: Path, overwrite: bool = False) -> None:
         ...
 
@@ -34,4 +34,12 @@ class ImageProcessingPort(Protocol):
     def resize(self, image: np.ndarray, target_hw: Tuple[int, int]) -> np.ndarray:
         ...
 
+    def bin_images(self, stack: np.ndarray, factor: int) -> np.ndarray:
+        """Bin every image in an (N, H, W[, C]) stack in one operation."""
+        ...
+
+    def resize_batch(self, stack: np.ndarray, target_hw: Tuple[int, int]) -> np.ndarray:
+        """Resize every image in an (N, H, W[, C]) stack to target_hw."""
+        ...
+
 
@@ -1,7 +1,7 @@
 from __future__ import annotations
 
 from pathlib import Path
-from typing import Protocol, List
+from typing import Protocol, List, Tuple
 
 
 class ImageJIntegrationPort(Protocol):
@@ -11,4 +11,6 @@ class ImageJIntegrationPort(Protocol):
         """Run a macro and return process return code."""
         ...
 
-
+    def run_macros(self, macros: List[Tuple[Path, List[str]]]) -> int:
+        """Run (macro_path, args) pairs in order, sharing one ImageJ launch."""
+        ...
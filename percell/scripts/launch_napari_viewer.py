@@ -5,6 +5,7 @@ Launch Napari Viewer - Cross-Platform Version
 This script launches Napari for interactive image visualization and analysis.
 Replaces the bash script with a cross-platform Python implementation.
 """
+import hashlib
 import os
 import sys
 import subprocess
@@ -69,6 +70,12 @@ class NapariLauncher:
         Args:
             python_exe: Path to Python executable
         """
+        # A previous successful check is trusted until site-packages changes
+        marker = self._napari_marker(python_exe)
+        if self._marker_is_current(marker, python_exe):
+            print("✓ napari is already installed")
+            return
+
         # Check if napari is installed
         check_cmd = [str(python_exe), "-c", "import napari"]
 
@@ -82,6 +89,7 @@ class NapariLauncher:
 
             if result.returncode == 0:
                 print("✓ napari is already installed")
+                self._touch_marker(marker)
                 return
 
         except subprocess.TimeoutExpired:
@@ -94,9 +102,47 @@ class NapariLauncher:
         try:
             subprocess.run(install_cmd, check=True)
             print("✓ napari installed successfully")
+            self._touch_marker(marker)
         except subprocess.CalledProcessError as e:
             self.handle_error(f"Failed to install napari: {e}")
 
+    @staticmethod
+    def _napari_marker(python_exe: Path) -> Path:
+        """Return the cache marker recording that napari imports under *python_exe*."""
+        key = hashlib.sha1(str(python_exe).encode()).hexdigest()[:16]
+        return Path.home() / ".cache" / "percell" / f"napari_ok_{key}"
+
+    @staticmethod
+    def _marker_is_current(marker: Path, python_exe: Path) -> bool:
+        """
+        Check that the marker is newer than every site-packages directory in the venv.
+
+        Any pip install, upgrade or uninstall touches site-packages, so a
+        changed napari installation is always re-verified.
+        """
+        env_dir = Path(python_exe).parent.parent
+        site_dirs = [
+            site_packages
+            for pattern in ("lib/python*/site-packages", "Lib/site-packages")
+            for site_packages in env_dir.glob(pattern)
+        ]
+        if not site_dirs:
+            return False
+        try:
+            verified_at = marker.stat().st_mtime
+            return all(verified_at > site_packages.stat().st_mtime for site_packages in site_dirs)
+        except OSError:
+            return False
+
+    @staticmethod
+    def _touch_marker(marker: Path):
+        """Create or refresh the marker; failing to cache is not an error."""
+        try:
+            marker.parent.mkdir(parents=True, exist_ok=True)
+            marker.touch()
+        except OSError:
+            pass
+
     def print_instructions(self):
         """Print user instructions."""
         separator = "=" * 75
@@ -144,11 +190,25 @@ class NapariLauncher:
         if self.images_dir:
             napari_cmd.append(str(self.images_dir))
 
+        if os.name == "posix":
+            # Replace this process with napari: no idle parent holding memory,
+            # and napari's exit status and signals reach the caller directly.
+            sys.stdout.flush()
+            sys.stderr.flush()
+            try:
+                os.execv(str(napari_python), napari_cmd)
+            except OSError as e:
+                self._napari_marker(napari_python).unlink(missing_ok=True)
+                self.handle_error(f"Failed to start Napari: {e}")
+
         try:
-            # Launch Napari (runs in foreground)
+            # Launch Napari (runs in foreground; Windows execv would detach it)
             result = subprocess.run(napari_cmd)
 
             if result.returncode != 0:
+                # Don't trust the cached check again; re-verify the install now
+                self._napari_marker(napari_python).unlink(missing_ok=True)
+                self.check_and_install_napari(napari_python)
                 self.handle_error("Napari exited with an error")
 
             print("Napari viewer closed. Continuing workflow...")
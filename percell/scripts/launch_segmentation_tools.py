@@ -5,10 +5,17 @@ Launch Segmentation Tools - Cross-Platform Version
 This script launches both Cellpose and ImageJ for interactive segmentation work.
 Replaces the bash script with a cross-platform Python implementation.
 """
+import functools
+import json
 import os
+import re
+import select
+import selectors
+import signal
 import sys
 import subprocess
 import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 # Add parent directory to path for imports
@@ -21,6 +28,146 @@ from percell.utils.path_utils import (
 )
 
 
+# The install-location probe stats a dozen candidate paths; do it once per run.
+# get_venv_python is pure path arithmetic and needs no cache.
+_get_imagej_executable = functools.lru_cache(maxsize=1)(get_imagej_executable)
+
+
+# (env_dir, package) -> installed version, filled by _installed_version()
+_INSTALLED_VERSIONS: dict = {}
+
+
+def _installed_version(env_dir: Path, package: str) -> str | None:
+    """
+    Look up a package's installed version from a venv's dist-info metadata.
+
+    Reads ``site-packages/*.dist-info/METADATA`` directly so no interpreter
+    has to be started for packages that are already installed.
+
+    Returns:
+        The version string, or None if no matching distribution was found
+    """
+    key = (str(env_dir), package)
+    if key in _INSTALLED_VERSIONS:
+        return _INSTALLED_VERSIONS[key]
+
+    wanted = re.sub(r"[-_.]+", "_", package).lower()
+    patterns = ("lib/python*/site-packages/*.dist-info", "Lib/site-packages/*.dist-info")
+    for pattern in patterns:
+        for dist_info in Path(env_dir).glob(pattern):
+            name = dist_info.name[:-len(".dist-info")].rsplit("-", 1)[0]
+            if re.sub(r"[-_.]+", "_", name).lower() != wanted:
+                continue
+            try:
+                with open(dist_info / "METADATA", encoding="utf-8") as f:
+                    for line in f:
+                        if line.startswith("Version:"):
+                            version = line.split(":", 1)[1].strip()
+                            _INSTALLED_VERSIONS[key] = version
+                            return version
+                        if not line.strip():
+                            break
+            except OSError:
+                continue
+    return None
+
+
+# Marker recording packages last verified in a venv; see _verified_packages()
+_VERIFIED_MARKER = ".percell_verified"
+_SITE_PACKAGES_PATTERNS = ("lib/python*/site-packages", "Lib/site-packages")
+
+
+def _verified_packages(env_dir: Path) -> dict | None:
+    """
+    Return the packages recorded as verified in *env_dir*, if still valid.
+
+    The record is trusted only while no site-packages directory has been
+    modified since it was written; any pip install or uninstall touches
+    site-packages and invalidates it.
+    """
+    try:
+        record = json.loads((Path(env_dir) / _VERIFIED_MARKER).read_text())
+        verified_at = record["verified_at"]
+        for pattern in _SITE_PACKAGES_PATTERNS:
+            for site_packages in Path(env_dir).glob(pattern):
+                if site_packages.stat().st_mtime > verified_at:
+                    return None
+        return record["packages"]
+    except (OSError, ValueError, KeyError, TypeError):
+        return None
+
+
+def _record_verified_packages(env_dir: Path, packages: dict):
+    """Write the verified-packages marker; failing to cache is not an error."""
+    record = {"packages": packages, "verified_at": time.time()}
+    try:
+        (Path(env_dir) / _VERIFIED_MARKER).write_text(json.dumps(record))
+    except OSError:
+        pass
+
+
+def _wait_process(proc: subprocess.Popen, timeout: float) -> int:
+    """
+    Wait for a child process to exit, sleeping in the kernel rather than polling.
+
+    Uses a pidfd on Linux and a kqueue process filter on macOS/BSD, falling
+    back to ``Popen.wait`` elsewhere.
+
+    Returns:
+        The process return code
+
+    Raises:
+        subprocess.TimeoutExpired: If the process is still running after *timeout*
+    """
+    if proc.poll() is not None:
+        return proc.returncode
+
+    try:
+        if hasattr(os, "pidfd_open"):
+            fd = os.pidfd_open(proc.pid, 0)
+            try:
+                poller = select.poll()
+                poller.register(fd, select.POLLIN)
+                exited = bool(poller.poll(timeout * 1000))
+            finally:
+                os.close(fd)
+        elif hasattr(select, "kqueue"):
+            kq = select.kqueue()
+            try:
+                event = select.kevent(
+                    proc.pid,
+                    filter=select.KQ_FILTER_PROC,
+                    flags=select.KQ_EV_ADD | select.KQ_EV_ONESHOT,
+                    fflags=select.KQ_NOTE_EXIT,
+                )
+                exited = bool(kq.control([event], 1, timeout))
+            finally:
+                kq.close()
+        else:
+            return proc.wait(timeout=timeout)
+    except OSError:
+        # Kernel lacks the facility or the child is already gone
+        return proc.wait(timeout=timeout)
+
+    if not exited:
+        raise subprocess.TimeoutExpired(proc.args, timeout)
+    return proc.wait()
+
+
+def _spawn_gui(cmd: list[str]) -> subprocess.Popen:
+    """
+    Start a GUI application in the background.
+
+    On Windows the child gets its own process group so it runs independently.
+    Elsewhere close_fds=False lets CPython use posix_spawn instead of
+    fork+exec; descriptors Python opens are non-inheritable (PEP 446), so
+    nothing leaks into the child.
+    """
+    if is_windows():
+        return subprocess.Popen(cmd, creationflags=subprocess.CREATE_NEW_PROCESS_GROUP)
+    return subprocess.Popen(cmd, close_fds=False)
+
+
 class SegmentationToolsLauncher:
     """Handles launching ImageJ and Cellpose for interactive segmentation."""
 
@@ -53,7 +200,7 @@ class SegmentationToolsLauncher:
         Raises:
             SystemExit if ImageJ not found
         """
-        imagej_exe = get_imagej_executable()
+        imagej_exe = _get_imagej_executable()
 
         if imagej_exe:
             return imagej_exe
@@ -99,6 +246,39 @@ class SegmentationToolsLauncher:
             package: Package name to check/install
             version: Optional specific version (e.g., "4.0.4")
         """
+        self.check_and_install_packages(python_exe, [(package, version)])
+
+    def check_and_install_packages(self, python_exe: Path, packages: list[tuple[str, str | None]]):
+        """
+        Check several packages and install the missing ones with a single pip run.
+
+        Args:
+            python_exe: Path to Python executable
+            packages: (package, version) pairs; version may be None
+        """
+        env_dir = Path(python_exe).parent.parent
+        requested = {package: version for package, version in packages}
+        if _verified_packages(env_dir) == requested:
+            print("✓ " + ", ".join(requested) + " already verified")
+            return
+
+        needed = self._collect_missing(python_exe, packages)
+        if needed:
+            self._pip_install_batch(python_exe, needed)
+        _record_verified_packages(env_dir, requested)
+
+    def _collect_missing(self, python_exe: Path, packages: list[tuple[str, str | None]]) -> list[tuple[str, str | None]]:
+        """Return the (package, version) pairs that are not importable in the environment."""
+        return [(package, version) for package, version in packages
+                if not self._package_installed(python_exe, package)]
+
+    def _package_installed(self, python_exe: Path, package: str) -> bool:
+        """Check whether *package* is installed, printing the outcome when it is."""
+        # Installed distributions are found without starting the interpreter
+        if _installed_version(Path(python_exe).parent.parent, package):
+            print(f"✓ {package} is already installed")
+            return True
+
         # Check if package is installed
         check_cmd = [str(python_exe), "-c", f"import {package}"]
 
@@ -112,50 +292,63 @@ class SegmentationToolsLauncher:
 
             if result.returncode == 0:
                 print(f"✓ {package} is already installed")
-                return
+                return True
             else:
                 # Check if it's just a NumPy compatibility warning
                 if "numpy" in result.stderr and "compatibility" in result.stderr:
                     print(f"✓ {package} detected with NumPy compatibility warning - this is normal")
-                    return
+                    return True
 
         except subprocess.TimeoutExpired:
             print(f"Warning: Timeout checking {package}, will attempt to install")
 
-        # Package not found, install it
-        print(f"Installing {package}...")
-        package_spec = f"{package}=={version}" if version else package
+        return False
+
+    def _pip_install_batch(self, python_exe: Path, packages: list[tuple[str, str | None]]):
+        """Install packages in one pip invocation so dependencies resolve once."""
+        names = ", ".join(package for package, _ in packages)
+        print(f"Installing {names}...")
+        specs = [f"{package}=={version}" if version else package for package, version in packages]
 
-        install_cmd = [str(python_exe), "-m", "pip", "install", package_spec]
+        install_cmd = [str(python_exe), "-m", "pip", "install", *specs]
 
         try:
             subprocess.run(install_cmd, check=True)
-            print(f"✓ {package} installed successfully")
+            print(f"✓ {names} installed successfully")
         except subprocess.CalledProcessError as e:
-            self.handle_error(f"Failed to install {package}: {e}")
+            self.handle_error(f"Failed to install {names}: {e}")
+
+    @staticmethod
+    def _wait_for_startup(process: subprocess.Popen, grace: float = 1.0) -> bool:
+        """
+        Wait up to *grace* seconds for a launched process to settle.
+
+        Returns as soon as the process exits, so a crash on startup is
+        reported immediately instead of after a fixed sleep.
+
+        Returns:
+            True if the process is still running after the grace period
+        """
+        try:
+            _wait_process(process, grace)
+        except subprocess.TimeoutExpired:
+            return True
+        return False
 
     def launch_imagej(self):
         """Launch ImageJ in the background."""
-        print("Starting ImageJ...")
-
         self.imagej_path = self.find_imagej()
+        self._start_imagej()
 
-        try:
-            # On Windows, we need to handle the executable differently
-            if is_windows():
-                # Use CREATE_NEW_PROCESS_GROUP to allow it to run independently
-                self.imagej_process = subprocess.Popen(
-                    [str(self.imagej_path)],
-                    creationflags=subprocess.CREATE_NEW_PROCESS_GROUP
-                )
-            else:
-                self.imagej_process = subprocess.Popen([str(self.imagej_path)])
+    def _start_imagej(self):
+        """Spawn the already-located ImageJ executable and confirm it starts."""
+        print("Starting ImageJ...")
 
-            # Give ImageJ a moment to start
-            time.sleep(2)
+        try:
+            self.imagej_process = _spawn_gui([str(self.imagej_path)])
 
-            # Check if it's still running
-            if self.imagej_process.poll() is not None:
+            # Fail fast if ImageJ exits during startup
+            if not self._wait_for_startup(self.imagej_process):
                 self.handle_error("ImageJ failed to start")
 
             print(f"✓ ImageJ launched (PID: {self.imagej_process.pid})")
@@ -165,43 +358,53 @@ class SegmentationToolsLauncher:
 
     def launch_cellpose(self):
         """Launch Cellpose GUI in the background."""
-        print("Starting Cellpose GUI...")
+        cellpose_python = self._prepare_cellpose()
+        self._start_cellpose(cellpose_python)
 
+    def _prepare_cellpose(self) -> Path:
+        """Locate the Cellpose environment and install its dependencies."""
         # Get Cellpose Python executable
         cellpose_python = self.get_cellpose_python()
 
         # Check and install dependencies
-        self.check_and_install_package(cellpose_python, "numpy")
-        self.check_and_install_package(cellpose_python, "cellpose", "4.0.4")
+        self.check_and_install_packages(cellpose_python, [("numpy", None), ("cellpose", "4.0.4")])
+        return cellpose_python
+
+    def _start_cellpose(self, cellpose_python: Path):
+        """Spawn the Cellpose GUI and confirm it starts."""
+        print("Starting Cellpose GUI...")
 
         try:
             # Launch Cellpose GUI
             cellpose_cmd = [str(cellpose_python), "-m", "cellpose"]
 
-            if is_windows():
-                # On Windows, use CREATE_NEW_PROCESS_GROUP
-                self.cellpose_process = subprocess.Popen(
-                    cellpose_cmd,
-                    creationflags=subprocess.CREATE_NEW_PROCESS_GROUP
-                )
-            else:
-                self.cellpose_process = subprocess.Popen(cellpose_cmd)
+            self.cellpose_process = _spawn_gui(cellpose_cmd)
 
-            # Give Cellpose a moment to start
-            time.sleep(2)
-
-            # Check if it's still running
-            if self.cellpose_process.poll() is not None:
+            # Fail fast if Cellpose exits during startup
+            if not self._wait_for_startup(self.cellpose_process):
                 self.handle_error("Cellpose failed to start")
 
             print(f"✓ Cellpose GUI launched (PID: {self.cellpose_process.pid})")
 
         except Exception as e:
-            # Clean up ImageJ if Cellpose fails
-            if self.imagej_process:
-                self.cleanup()
             self.handle_error(f"Failed to start Cellpose: {e}")
 
+    def launch_tools(self):
+        """Launch ImageJ and Cellpose, overlapping only their startup waits."""
+        # Locate both tools and install dependencies first, in order, so a
+        # missing ImageJ stops before any install and pip output stays readable
+        self.imagej_path = self.find_imagej()
+        cellpose_python = self._prepare_cellpose()
+
+        with ThreadPoolExecutor(max_workers=2) as pool:
+            futures = [pool.submit(self._start_imagej), pool.submit(self._start_cellpose, cellpose_python)]
+
+        # handle_error() raises SystemExit inside the worker; re-raise it here
+        errors = [f.exception() for f in futures if f.exception() is not None]
+        if errors:
+            self.cleanup()
+            raise errors[0]
+
     def print_instructions(self):
         """Print user instructions."""
         separator = "=" * 75
@@ -222,12 +425,77 @@ class SegmentationToolsLauncher:
         print(f"\n{separator}\n")
 
     def wait_for_user(self):
-        """Wait for user to press Enter."""
+        """Wait for user to press Enter, or for both tools to be closed."""
         try:
-            input()
+            if os.name == "posix":
+                self._wait_for_enter_or_exit()
+            else:
+                input()
         except KeyboardInterrupt:
             print("\nInterrupted by user")
 
+    def _wait_for_enter_or_exit(self):
+        """
+        Block on stdin and on child exits at the same time.
+
+        SIGCHLD is funnelled through a wakeup pipe so a GUI closed by the user
+        is noticed immediately; once both are gone there is nothing left to
+        wait for and the workflow continues.
+        """
+        selector = selectors.DefaultSelector()
+        try:
+            selector.register(sys.stdin, selectors.EVENT_READ)
+        except (OSError, ValueError, AttributeError):
+            # stdin is a regular file (epoll refuses those), closed or missing
+            selector.close()
+            input()
+            return
+
+        rfd, wfd = os.pipe()
+        os.set_blocking(rfd, False)
+        os.set_blocking(wfd, False)
+        try:
+            old_wakeup_fd = signal.set_wakeup_fd(wfd)
+        except ValueError:
+            # Not on the main thread; signals cannot be routed here
+            selector.close()
+            os.close(rfd)
+            os.close(wfd)
+            input()
+            return
+        old_handler = signal.signal(signal.SIGCHLD, lambda *_: None)
+
+        running = {
+            name: proc
+            for name, proc in (("Cellpose", self.cellpose_process), ("ImageJ", self.imagej_process))
+            if proc is not None
+        }
+        try:
+            with selector:
+                selector.register(rfd, selectors.EVENT_READ)
+                while True:
+                    for key, _ in selector.select():
+                        if key.fd != rfd:
+                            sys.stdin.readline()
+                            return
+                        try:
+                            while os.read(rfd, 512):
+                                pass
+                        except BlockingIOError:
+                            pass
+                        for name, proc in list(running.items()):
+                            if proc.poll() is not None:
+                                print(f"{name} was closed (exit code {proc.returncode})")
+                                del running[name]
+                    if not running:
+                        print("Cellpose and FIJI are both closed. Continuing...")
+                        return
+        finally:
+            signal.signal(signal.SIGCHLD, old_handler)
+            signal.set_wakeup_fd(old_wakeup_fd)
+            os.close(rfd)
+            os.close(wfd)
+
     def cleanup(self):
         """Close background processes."""
         print("Closing Cellpose and FIJI...")
@@ -235,7 +503,7 @@ class SegmentationToolsLauncher:
         if self.cellpose_process:
             try:
                 self.cellpose_process.terminate()
-                self.cellpose_process.wait(timeout=5)
+                _wait_process(self.cellpose_process, timeout=5)
                 print("✓ Cellpose closed")
             except subprocess.TimeoutExpired:
                 self.cellpose_process.kill()
@@ -246,7 +514,7 @@ class SegmentationToolsLauncher:
         if self.imagej_process:
             try:
                 self.imagej_process.terminate()
-                self.imagej_process.wait(timeout=5)
+                _wait_process(self.imagej_process, timeout=5)
                 print("✓ ImageJ closed")
             except subprocess.TimeoutExpired:
                 self.imagej_process.kill()
@@ -261,8 +529,7 @@ class SegmentationToolsLauncher:
         print()
 
         # Launch both tools
-        self.launch_imagej()
-        self.launch_cellpose()
+        self.launch_tools()
 
         # Print instructions
         self.print_instructions()
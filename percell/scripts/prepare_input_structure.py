@@ -16,42 +16,61 @@ import os
 import sys
 import re
 import shutil
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
 from pathlib import Path
 from typing import List
 
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 
-# ANSI color codes for better readability (work on most terminals)
-class Colors:
-    """Terminal color codes."""
-    RED = '\033[0;31m'
-    GREEN = '\033[0;32m'
-    BLUE = '\033[0;34m'
-    YELLOW = '\033[1;33m'
-    NC = '\033[0m'  # No Color
+from percell.utils.colors import Colors
 
-    @staticmethod
-    def disable_on_windows():
-        """Disable colors on Windows if colorama not available."""
-        try:
-            import colorama
-            colorama.init()
-        except ImportError:
-            # Disable colors if colorama not available
-            Colors.RED = ''
-            Colors.GREEN = ''
-            Colors.BLUE = ''
-            Colors.YELLOW = ''
-            Colors.NC = ''
+# Filename tokens, matched as loosely as FileNamingService does
+_TIMEPOINT_PATTERN = re.compile(r't\d+')
+_CHANNEL_PATTERN = re.compile(r'ch\d+')
 
-
-# Initialize colors
-if sys.platform == 'win32':
-    Colors.disable_on_windows()
+# Per-thread output buffer; None means print directly
+_output = threading.local()
 
 
 def print_color(message: str, color: str = Colors.NC):
-    """Print colored message."""
-    print(f"{color}{message}{Colors.NC}")
+    """Print colored message, or buffer it on threads that collect output."""
+    line = f"{color}{message}{Colors.NC}\n"
+    lines = getattr(_output, "lines", None)
+    if lines is not None:
+        lines.append(line)
+    else:
+        sys.stdout.write(line)
+
+
+@contextmanager
+def _collect_output():
+    """Buffer print_color output on this thread; yields the list of lines."""
+    lines = []
+    _output.lines = lines
+    try:
+        yield lines
+    finally:
+        _output.lines = None
+
+
+def _fast_move(src: Path, dst: Path):
+    """
+    Move a file with a single rename, falling back to shutil.move.
+
+    Moves within the input tree stay on one filesystem, so the rename
+    avoids copying data; the fallback covers cross-device moves.
+
+    Args:
+        src: File to move
+        dst: Destination file path
+    """
+    try:
+        os.replace(src, dst)
+    except OSError:
+        shutil.move(str(src), str(dst))
 
 
 def count_tif_files(directory: Path) -> int:
@@ -64,7 +83,8 @@ def count_tif_files(directory: Path) -> int:
     Returns:
         Number of .tif files found
     """
-    return len(list(directory.glob("*.tif")))
+    with os.scandir(directory) as entries:
+        return sum(1 for entry in entries if entry.name.endswith(".tif") and entry.is_file())
 
 
 def has_subdirectories(directory: Path) -> bool:
@@ -77,7 +97,8 @@ def has_subdirectories(directory: Path) -> bool:
     Returns:
         True if subdirectories exist, False otherwise
     """
-    return any(item.is_dir() for item in directory.iterdir())
+    with os.scandir(directory) as entries:
+        return any(entry.is_dir() for entry in entries)
 
 
 def has_timepoint_pattern(filename: str) -> bool:
@@ -90,7 +111,7 @@ def has_timepoint_pattern(filename: str) -> bool:
     Returns:
         True if pattern found, False otherwise
     """
-    return bool(re.search(r't\d+', filename))
+    return _TIMEPOINT_PATTERN.search(filename) is not None
 
 
 def has_channel_pattern(filename: str) -> bool:
@@ -103,7 +124,7 @@ def has_channel_pattern(filename: str) -> bool:
     Returns:
         True if pattern found, False otherwise
     """
-    return bool(re.search(r'ch\d+', filename))
+    return _CHANNEL_PATTERN.search(filename) is not None
 
 
 def process_condition_directory(condition_dir: Path):
@@ -122,25 +143,25 @@ def process_condition_directory(condition_dir: Path):
     for tif_file in condition_dir.glob("*.tif"):
         if tif_file.is_file():
             filename = tif_file.name
-            new_filename = filename
+            stem = filename[:-len('.tif')]
+            suffix = ''
 
             # Check if missing timepoint pattern
             if not has_timepoint_pattern(filename):
                 print_color(f"File missing timepoint pattern: {filename}", Colors.YELLOW)
-                new_filename = new_filename.replace('.tif', '_t00.tif')
-                print_color(f"Adding timepoint pattern: {new_filename}", Colors.GREEN)
+                suffix += '_t00'
+                print_color(f"Adding timepoint pattern: {stem}{suffix}.tif", Colors.GREEN)
 
             # Check if missing channel pattern
-            if not has_channel_pattern(new_filename):
-                print_color(f"File missing channel pattern: {new_filename}", Colors.YELLOW)
-                new_filename = new_filename.replace('.tif', '_ch00.tif')
-                print_color(f"Adding channel pattern: {new_filename}", Colors.GREEN)
+            if not has_channel_pattern(filename):
+                print_color(f"File missing channel pattern: {stem}{suffix}.tif", Colors.YELLOW)
+                suffix += '_ch00'
+                print_color(f"Adding channel pattern: {stem}{suffix}.tif", Colors.GREEN)
 
-            # Rename file if needed
-            if new_filename != filename:
-                new_path = condition_dir / new_filename
-                tif_file.rename(new_path)
-                filename = new_filename
+            # Rename at most once, with both tokens added to the stem
+            if suffix:
+                filename = f"{stem}{suffix}.tif"
+                tif_file.rename(condition_dir / filename)
 
             # Each file is considered its own region
             print_color(f"File will be treated as Region {region_counter}: {filename}", Colors.GREEN)
@@ -156,19 +177,24 @@ def remove_metadata_directories(input_dir: Path):
     """
     print_color("Searching for and removing MetaData directories...", Colors.BLUE)
 
-    metadata_dirs = list(input_dir.rglob("MetaData"))
-
-    for metadata_dir in metadata_dirs:
-        if metadata_dir.is_dir():
+    # Prune MetaData from the walk as it is removed so it is never descended into
+    failed = []
+    for dirpath, dirnames, _ in os.walk(input_dir):
+        if "MetaData" in dirnames:
+            dirnames.remove("MetaData")
+            metadata_dir = Path(dirpath) / "MetaData"
             print_color(f"Removing MetaData directory: {metadata_dir}", Colors.YELLOW)
-            shutil.rmtree(metadata_dir)
+            try:
+                shutil.rmtree(metadata_dir)
+            except OSError as e:
+                print_color(f"Could not remove {metadata_dir}: {e}", Colors.RED)
+                failed.append(metadata_dir)
 
     # Report results
-    remaining = len(list(input_dir.rglob("MetaData")))
-    if remaining == 0:
+    if not failed:
         print_color("No MetaData directories found or all have been successfully removed", Colors.GREEN)
     else:
-        print_color(f"Warning: {remaining} MetaData directories could not be removed", Colors.RED)
+        print_color(f"Warning: {len(failed)} MetaData directories could not be removed", Colors.RED)
 
 
 def print_directory_structure(input_dir: Path):
@@ -180,20 +206,15 @@ def print_directory_structure(input_dir: Path):
     """
     print_color("Final directory structure:", Colors.BLUE)
 
-    # Get all directories and sort them
-    directories = sorted([input_dir] + list(input_dir.rglob("*")))
-
-    for directory in directories:
-        if directory.is_dir():
-            # Calculate relative depth
-            try:
-                rel_path = directory.relative_to(input_dir)
-                depth = len(rel_path.parts)
-            except ValueError:
-                depth = 0
-
-            indent = "  " * depth
-            print(f"{indent}{directory.name}/")
+    # Walk directories in sorted order; files are never visited, and depth
+    # comes from separator counts rather than a Path per directory
+    base = os.path.normpath(input_dir)
+    base_depth = base.count(os.sep)
+    for dirpath, dirnames, _ in os.walk(base):
+        dirnames.sort()
+        depth = dirpath.count(os.sep) - base_depth
+        name = os.path.basename(dirpath) if depth else Path(input_dir).name
+        print(f"{'  ' * depth}{name}/")
 
 
 def print_tif_files(input_dir: Path):
@@ -205,11 +226,123 @@ def print_tif_files(input_dir: Path):
     """
     print_color("Final .tif files:", Colors.BLUE)
 
-    tif_files = sorted(input_dir.rglob("*.tif"))
+    # Stream in sorted-path order, writing in chunks rather than per line
+    buf = []
+    for rel_path in _iter_sorted_tifs(input_dir):
+        buf.append(f"  {rel_path}\n")
+        if len(buf) >= 256:
+            sys.stdout.write("".join(buf))
+            buf.clear()
+    sys.stdout.write("".join(buf))
+    sys.stdout.flush()
+
+
+def _iter_sorted_tifs(directory: Path, prefix: str = ""):
+    """
+    Yield relative paths of .tif files under *directory*, depth first.
+
+    Entries are visited in name order, which reproduces sorting the full
+    path list without ever holding it in memory.
+    """
+    with os.scandir(directory) as it:
+        entries = sorted(it, key=lambda entry: entry.name)
+    for entry in entries:
+        rel_path = os.path.join(prefix, entry.name) if prefix else entry.name
+        if entry.is_dir(follow_symlinks=False):
+            yield from _iter_sorted_tifs(Path(entry.path), rel_path)
+        elif entry.name.endswith(".tif"):
+            yield rel_path
 
-    for tif_file in tif_files:
-        rel_path = tif_file.relative_to(input_dir)
-        print(f"  {rel_path}")
+
+def _process_condition(subdir: Path) -> List[str]:
+    """
+    Normalize one condition subdirectory (Cases 2 and 3).
+
+    Runs on a worker thread; output is buffered and returned so the caller
+    can write each condition's messages together, in directory order.
+
+    Args:
+        subdir: Condition directory directly under the input directory
+
+    Returns:
+        The lines that would have been printed
+    """
+    with _collect_output() as lines:
+        # Count .tif files in this subdirectory
+        subdir_tif_count = count_tif_files(subdir)
+
+        if subdir_tif_count > 0:
+            # Case 2: One layer of subdirectories with .tif files
+            # Files are already in the right place (condition directory)
+            condition_name = subdir.name
+            print_color(f"Found {subdir_tif_count} .tif files in: {condition_name}", Colors.BLUE)
+
+            # Process files in the condition directory (add tokens if missing)
+            process_condition_directory(subdir)
+
+            print_color(f"Condition {condition_name}/ structure is correct", Colors.GREEN)
+
+        else:
+            # Check if this might be a condition directory with subdirectories
+            if has_subdirectories(subdir):
+                condition_name = subdir.name
+                print_color(f"Subdirectory {condition_name} has nested subdirs", Colors.BLUE)
+
+                # Check subdirectories for .tif files and flatten them
+                tif_files_found = False
+
+                for nested_dir in subdir.iterdir():
+                    if nested_dir.is_dir():
+                        nested_tif_count = count_tif_files(nested_dir)
+
+                        if nested_tif_count > 0:
+                            tif_files_found = True
+                            nested_name = nested_dir.name
+                            print_color(
+                                f"Found {nested_tif_count} .tif files in "
+                                f"{condition_name}/{nested_name}",
+                                Colors.BLUE
+                            )
+                            print_color(
+                                f"Flattening: moving files to {condition_name}/",
+                                Colors.YELLOW
+                            )
+
+                            # Move files up to condition directory
+                            for tif_file in nested_dir.glob("*.tif"):
+                                if tif_file.is_file():
+                                    dest = subdir / tif_file.name
+                                    _fast_move(tif_file, dest)
+
+                            # Remove empty nested directory
+                            try:
+                                nested_dir.rmdir()
+                                print_color(
+                                    f"Removed empty directory: {nested_name}",
+                                    Colors.BLUE
+                                )
+                            except OSError:
+                                # Directory not empty, leave it
+                                pass
+
+                if tif_files_found:
+                    # Process all files now in condition directory
+                    process_condition_directory(subdir)
+                    print_color(
+                        f"Flattened {condition_name}/ structure",
+                        Colors.GREEN
+                    )
+                else:
+                    print_color(
+                        f"No .tif files found in subdirs of {condition_name}",
+                        Colors.YELLOW
+                    )
+            else:
+                print_color(
+                    f"No .tif files or subdirs found in {subdir.name}",
+                    Colors.YELLOW
+                )
+    return lines
 
 
 def prepare_input_structure(input_dir: Path):
@@ -239,10 +372,12 @@ def prepare_input_structure(input_dir: Path):
         # Move all .tif files into the new structure
         for tif_file in input_dir.glob("*.tif"):
             if tif_file.is_file():
-                shutil.move(str(tif_file), str(target_dir / tif_file.name))
+                _fast_move(tif_file, target_dir / tif_file.name)
 
-        # Process files in the condition directory
-        process_condition_directory(target_dir)
+        # Process files in the condition directory, writing its log in one go
+        with _collect_output() as lines:
+            process_condition_directory(target_dir)
+        sys.stdout.write("".join(lines))
 
         print_color("Successfully reorganized .tif files into condition_1/", Colors.GREEN)
 
@@ -251,85 +386,15 @@ def prepare_input_structure(input_dir: Path):
         if has_subdirectories(input_dir):
             print_color("Found subdirectories in the input directory", Colors.BLUE)
 
-            # Iterate through each subdirectory
-            for subdir in input_dir.iterdir():
-                if not subdir.is_dir() or subdir.name == "MetaData":
-                    continue
-
-                # Count .tif files in this subdirectory
-                subdir_tif_count = count_tif_files(subdir)
-
-                if subdir_tif_count > 0:
-                    # Case 2: One layer of subdirectories with .tif files
-                    # Files are already in the right place (condition directory)
-                    condition_name = subdir.name
-                    print_color(f"Found {subdir_tif_count} .tif files in: {condition_name}", Colors.BLUE)
-
-                    # Process files in the condition directory (add tokens if missing)
-                    process_condition_directory(subdir)
-
-                    print_color(f"Condition {condition_name}/ structure is correct", Colors.GREEN)
-
-                else:
-                    # Check if this might be a condition directory with subdirectories
-                    if has_subdirectories(subdir):
-                        condition_name = subdir.name
-                        print_color(f"Subdirectory {condition_name} has nested subdirs", Colors.BLUE)
-
-                        # Check subdirectories for .tif files and flatten them
-                        tif_files_found = False
-
-                        for nested_dir in subdir.iterdir():
-                            if nested_dir.is_dir():
-                                nested_tif_count = count_tif_files(nested_dir)
-
-                                if nested_tif_count > 0:
-                                    tif_files_found = True
-                                    nested_name = nested_dir.name
-                                    print_color(
-                                        f"Found {nested_tif_count} .tif files in "
-                                        f"{condition_name}/{nested_name}",
-                                        Colors.BLUE
-                                    )
-                                    print_color(
-                                        f"Flattening: moving files to {condition_name}/",
-                                        Colors.YELLOW
-                                    )
-
-                                    # Move files up to condition directory
-                                    for tif_file in nested_dir.glob("*.tif"):
-                                        if tif_file.is_file():
-                                            dest = subdir / tif_file.name
-                                            shutil.move(str(tif_file), str(dest))
-
-                                    # Remove empty nested directory
-                                    try:
-                                        nested_dir.rmdir()
-                                        print_color(
-                                            f"Removed empty directory: {nested_name}",
-                                            Colors.BLUE
-                                        )
-                                    except OSError:
-                                        # Directory not empty, leave it
-                                        pass
-
-                        if tif_files_found:
-                            # Process all files now in condition directory
-                            process_condition_directory(subdir)
-                            print_color(
-                                f"Flattened {condition_name}/ structure",
-                                Colors.GREEN
-                            )
-                        else:
-                            print_color(
-                                f"No .tif files found in subdirs of {condition_name}",
-                                Colors.YELLOW
-                            )
-                    else:
-                        print_color(
-                            f"No .tif files or subdirs found in {subdir.name}",
-                            Colors.YELLOW
-                        )
+            # Conditions are independent, so their renames and moves can overlap
+            conditions = [
+                subdir for subdir in input_dir.iterdir()
+                if subdir.is_dir() and subdir.name != "MetaData"
+            ]
+            if conditions:
+                with ThreadPoolExecutor(max_workers=min(8, len(conditions))) as pool:
+                    for lines in pool.map(_process_condition, conditions):
+                        sys.stdout.write("".join(lines))
         else:
             print_color("No .tif files or subdirectories found in the input directory", Colors.YELLOW)
 
@@ -8,42 +8,14 @@ Files will be copied later after data selection is complete.
 
 Replaces the bash script with a cross-platform Python implementation.
 """
+import os
 import sys
 from pathlib import Path
 
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 
-# ANSI color codes for better readability (work on most terminals)
-class Colors:
-    """Terminal color codes."""
-    RED = '\033[0;31m'
-    GREEN = '\033[0;32m'
-    BLUE = '\033[0;34m'
-    YELLOW = '\033[1;33m'
-    NC = '\033[0m'  # No Color
-
-    @staticmethod
-    def disable_on_windows():
-        """Disable colors on Windows if colorama not available."""
-        try:
-            import colorama
-            colorama.init()
-        except ImportError:
-            # Disable colors if colorama not available
-            Colors.RED = ''
-            Colors.GREEN = ''
-            Colors.BLUE = ''
-            Colors.YELLOW = ''
-            Colors.NC = ''
-
-
-# Initialize colors
-if sys.platform == 'win32':
-    Colors.disable_on_windows()
-
-
-def print_color(message: str, color: str = Colors.NC):
-    """Print colored message."""
-    print(f"{color}{message}{Colors.NC}")
+from percell.utils.colors import Colors, print_color
 
 
 def print_directory_structure(output_dir: Path, max_depth: int = 3):
@@ -56,32 +28,18 @@ def print_directory_structure(output_dir: Path, max_depth: int = 3):
     """
     print_color("Final output directory structure:", Colors.BLUE)
 
-    # Get all directories up to max_depth and sort them
-    directories = [output_dir]
+    # Walk directories in sorted order, stopping below max_depth; depth
+    # comes from separator counts rather than a Path per directory
+    base = os.path.normpath(output_dir)
+    base_depth = base.count(os.sep)
+    for dirpath, dirnames, _ in os.walk(base):
+        dirnames.sort()
+        depth = dirpath.count(os.sep) - base_depth
+        if depth >= max_depth:
+            dirnames[:] = []
 
-    def get_dirs_recursive(path: Path, current_depth: int = 0):
-        """Recursively get directories up to max_depth."""
-        if current_depth >= max_depth:
-            return
-
-        for item in sorted(path.iterdir()):
-            if item.is_dir():
-                directories.append(item)
-                get_dirs_recursive(item, current_depth + 1)
-
-    get_dirs_recursive(output_dir)
-
-    # Print directory tree
-    for directory in sorted(directories):
-        # Calculate relative depth
-        try:
-            rel_path = directory.relative_to(output_dir)
-            depth = len(rel_path.parts)
-        except ValueError:
-            depth = 0
-
-        indent = "  " * depth
-        print(f"{indent}{directory.name}/")
+        name = os.path.basename(dirpath) if depth else Path(output_dir).name
+        print(f"{'  ' * depth}{name}/")
 
 
 def setup_output_structure(input_dir: Path, output_dir: Path):
@@ -112,9 +70,25 @@ def setup_output_structure(input_dir: Path, output_dir: Path):
         "preprocessed",
     ]
 
-    for dir_name in main_directories:
-        dir_path = output_dir / dir_name
-        dir_path.mkdir(parents=True, exist_ok=True)
+    # Create the shared parent once; children are then single mkdir calls,
+    # resolved relative to the parent's descriptor where the OS supports it
+    output_dir.mkdir(parents=True, exist_ok=True)
+    if os.mkdir in os.supports_dir_fd:
+        parent_fd = os.open(output_dir, os.O_RDONLY | getattr(os, "O_DIRECTORY", 0))
+        try:
+            for dir_name in main_directories:
+                try:
+                    os.mkdir(dir_name, dir_fd=parent_fd)
+                except FileExistsError:
+                    pass
+        finally:
+            os.close(parent_fd)
+    else:
+        for dir_name in main_directories:
+            try:
+                os.mkdir(output_dir / dir_name)
+            except FileExistsError:
+                pass
 
     print_color("Base directory structure created", Colors.GREEN)
 
@@ -0,0 +1,38 @@
+"""
+Terminal color helpers shared by the cross-platform setup scripts.
+"""
+import sys
+
+
+# ANSI color codes for better readability (work on most terminals)
+class Colors:
+    """Terminal color codes."""
+    RED = '\033[0;31m'
+    GREEN = '\033[0;32m'
+    BLUE = '\033[0;34m'
+    YELLOW = '\033[1;33m'
+    NC = '\033[0m'  # No Color
+
+    @staticmethod
+    def disable_on_windows():
+        """Disable colors on Windows if colorama not available."""
+        try:
+            import colorama
+            colorama.init()
+        except ImportError:
+            # Disable colors if colorama not available
+            Colors.RED = ''
+            Colors.GREEN = ''
+            Colors.BLUE = ''
+            Colors.YELLOW = ''
+            Colors.NC = ''
+
+
+# Initialize colors once per process
+if sys.platform == 'win32':
+    Colors.disable_on_windows()
+
+
+def print_color(message: str, color: str = Colors.NC):
+    """Print colored message."""
+    print(f"{color}{message}{Colors.NC}")
@@ -34,3 +34,58 @@ def test_cellpose_adapter_success(mock_run, tmp_path: Path):
     mock_run.assert_called()
 
 
+
+
+@patch("subprocess.run")
+def test_cellpose_adapter_runs_images_in_one_batch(mock_run, tmp_path: Path):
+    mock_run.return_value = MagicMock(returncode=0, stdout="ok", stderr="")
+
+    out = tmp_path / "out"
+    out.mkdir()
+    images = []
+    for name in ("a", "b", "c"):
+        img = tmp_path / f"{name}.tif"
+        img.write_bytes(b"dummy")
+        (out / f"{name}_mask.tif").write_bytes(b"x")
+        images.append(img)
+
+    adapter = CellposeSubprocessAdapter(Path("/usr/bin/python"))
+    params = SegmentationParameters(30.0, 0.4, 0.0, "nuclei")
+
+    masks = adapter.run_segmentation(images, out, params)
+    assert masks == [out / "a_mask.tif", out / "b_mask.tif", out / "c_mask.tif"]
+    assert mock_run.call_count == 1
+
+
+@patch("subprocess.run")
+def test_cellpose_adapter_retries_failed_batch_per_image(mock_run, tmp_path: Path):
+    mock_run.side_effect = [
+        MagicMock(returncode=1, stdout="", stderr="boom"),
+        MagicMock(returncode=1, stdout="", stderr="bad image"),
+        MagicMock(returncode=0, stdout="ok", stderr=""),
+    ]
+
+    out = tmp_path / "out"
+    out.mkdir()
+    images = []
+    for name in ("a", "b"):
+        img = tmp_path / f"{name}.tif"
+        img.write_bytes(b"dummy")
+        (out / f"{name}_mask.tif").write_bytes(b"x")
+        images.append(img)
+
+    adapter = CellposeSubprocessAdapter(Path("/usr/bin/python"))
+    params = SegmentationParameters(30.0, 0.4, 0.0, "nuclei")
+
+    masks = adapter.run_segmentation(images, out, params)
+    assert masks == [out / "b_mask.tif"]
+    assert mock_run.call_count == 3
+
+
+def test_cellpose_command_passes_thresholds(tmp_path: Path):
+    adapter = CellposeSubprocessAdapter(Path("/usr/bin/python"))
+    params = SegmentationParameters(30.0, 0.0, -1.0, "nuclei")
+
+    cmd = adapter._build_cellpose_command(tmp_path, params)
+    assert cmd[cmd.index("--flow_threshold") + 1] == "0.0"
+    assert cmd[cmd.index("--cellprob_threshold") + 1] == "-1.0"
@@ -156,3 +156,37 @@ def test_stub_cleanup_called(tmp_path: Path, monkeypatch: pytest.MonkeyPatch):
 
     # Should be called at least twice: once before, once in finally
     assert len(cleanup_calls) >= 2
+
+
+# ---------------------------------------------------------------------------
+# Test: chained macros share one launch
+# ---------------------------------------------------------------------------
+
+@pytest.mark.integration
+def test_run_macros_chains_into_one_launch(tmp_path: Path):
+    """Several macros run through one wrapper macro that is removed after."""
+    adapter = ImageJMacroAdapter(imagej_executable=Path(sys.executable))
+    launched = []
+
+    def fake_run_macro(macro_path: Path, args):
+        macro_path = Path(macro_path)
+        content = macro_path.read_text() if macro_path.exists() else None
+        launched.append((macro_path, content, args))
+        return 0
+
+    adapter.run_macro = fake_run_macro
+    pb = tmp_path / "pb.ijm"
+    sg = tmp_path / 'sg "x".ijm'
+    result = adapter.run_macros([(pb, [str(tmp_path)]), (sg, [str(tmp_path)])])
+
+    assert result == 0
+    assert len(launched) == 1
+    chain_path, content, args = launched[0]
+    assert args == []
+    assert not chain_path.exists()
+    assert content.index(f'runMacro("{pb}"') < content.index('sg \\"x\\".ijm')
+    assert content.rstrip().endswith(f'print("{MACRO_DONE_SENTINEL}");\nrun("Quit");')
+
+    launched.clear()
+    adapter.run_macros([(pb, ["a"])])
+    assert launched[0][0] == pb and launched[0][2] == ["a"]
@@ -26,3 +26,22 @@ def test_list_copy_move_ensure_dir(tmp_path: Path):
     assert moved.exists() and not dst_file.exists()
 
 
+def test_copy_many_copies_all_and_reports_failures(tmp_path: Path):
+    fs = LocalFileSystemAdapter()
+    sources = []
+    for i in range(10):
+        src = tmp_path / f"{i}.tif"
+        src.write_bytes(bytes([i]))
+        sources.append(src)
+
+    fs.copy_many([(src, tmp_path / "out" / src.name) for src in sources])
+    assert sorted(p.name for p in (tmp_path / "out").iterdir()) == sorted(s.name for s in sources)
+
+    missing = tmp_path / "missing.tif"
+    try:
+        fs.copy_many([(missing, tmp_path / "out" / "x.tif"), (sources[0], tmp_path / "out2" / "a.tif")])
+    except OSError as e:
+        assert "missing.tif" in str(e)
+    else:
+        raise AssertionError("expected OSError")
+    assert (tmp_path / "out2" / "a.tif").exists()
@@ -1,5 +1,6 @@
 from pathlib import Path
 import numpy as np
+import pytest
 
 from percell.adapters.pil_image_processing_adapter import PILImageProcessingAdapter
 
@@ -20,3 +21,27 @@ def test_read_write_bin_resize(tmp_path: Path):
     assert resized.shape == (20, 20)
 
 
+
+def test_batched_bin_and_resize_match_single_image_ops():
+    adapter = PILImageProcessingAdapter()
+    stack = np.arange(3 * 11 * 13, dtype=np.uint16).reshape(3, 11, 13)
+
+    binned = adapter.bin_images(stack, 2)
+    assert binned.shape == (3, 5, 6)
+    for image, result in zip(stack, binned):
+        assert np.array_equal(result, adapter.bin_image(image, 2))
+
+    rgb = np.arange(2 * 10 * 10 * 3, dtype=np.uint8).reshape(2, 10, 10, 3)
+    resized = adapter.resize_batch(rgb, (20, 16))
+    assert resized.shape == (2, 20, 16, 3)
+    assert np.array_equal(resized[1], adapter.resize(rgb[1], (20, 16)))
+
+
+def test_read_image_returns_first_plane_of_compressed_tiff(tmp_path: Path):
+    tifffile = pytest.importorskip("tifffile")
+    stack = np.arange(2 * 64 * 64, dtype=np.uint16).reshape(2, 64, 64)
+    p = tmp_path / "stack.tif"
+    tifffile.imwrite(p, stack, imagej=True, compression="zlib", rowsperstrip=8)
+
+    adapter = PILImageProcessingAdapter()
+    np.testing.assert_array_equal(adapter.read_image(p), stack[0])
@@ -0,0 +1,49 @@
+"""Unit tests for shared UI components."""
+from percell.application.ui_components import BatchedUserInterface
+
+
+class RecordingUI:
+    """Minimal UI that records every call in order."""
+
+    def __init__(self):
+        self.calls = []
+
+    def info(self, message: str) -> None:
+        self.calls.append(("info", message))
+
+    def error(self, message: str) -> None:
+        self.calls.append(("error", message))
+
+    def prompt(self, message: str) -> str:
+        self.calls.append(("prompt", message))
+        return "answer"
+
+
+class TestBatchedUserInterface:
+    def test_flushes_when_batch_is_full(self):
+        ui = RecordingUI()
+        batched = BatchedUserInterface(ui, batch_size=2)
+        batched.info("a")
+        assert ui.calls == []
+        batched.info("b")
+        assert ui.calls == [("info", "a\nb")]
+
+    def test_context_manager_flushes_remainder(self):
+        ui = RecordingUI()
+        with BatchedUserInterface(ui) as batched:
+            batched.info("a")
+        assert ui.calls == [("info", "a")]
+
+    def test_error_and_prompt_preserve_ordering(self):
+        ui = RecordingUI()
+        batched = BatchedUserInterface(ui)
+        batched.info("a")
+        batched.error("boom")
+        batched.info("b")
+        assert batched.prompt("continue?") == "answer"
+        assert ui.calls == [
+            ("info", "a"),
+            ("error", "boom"),
+            ("info", "b"),
+            ("prompt", "continue?"),
+        ]
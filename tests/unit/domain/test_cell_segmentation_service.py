@@ -0,0 +1,35 @@
+import pytest
+
+from percell.domain import CellSegmentationService
+from percell.domain.models import ImageDimensions, SegmentationPreferences
+
+
+@pytest.fixture()
+def svc() -> CellSegmentationService:
+    return CellSegmentationService()
+
+
+class TestPrepareSegmentationParameters:
+    @pytest.mark.parametrize(
+        "target, flow, prob",
+        [
+            ("fast", 0.2, -1.0),
+            ("balanced", 0.4, 0.0),
+            ("quality", 0.4, 0.0),
+        ],
+    )
+    def test_thresholds_per_performance_target(self, svc: CellSegmentationService, target: str, flow: float, prob: float):
+        params = svc.prepare_segmentation_parameters(
+            ImageDimensions(width=1024, height=1024),
+            SegmentationPreferences(performance_target=target),
+        )
+        assert params.flow_threshold == flow
+        assert params.probability_threshold == prob
+
+    @pytest.mark.parametrize("target", ["fast", "balanced", "quality"])
+    def test_skip_flow_check_disables_flow_threshold(self, svc: CellSegmentationService, target: str):
+        params = svc.prepare_segmentation_parameters(
+            ImageDimensions(width=1024, height=1024),
+            SegmentationPreferences(performance_target=target, skip_flow_check=True),
+        )
+        assert params.flow_threshold == 0.0
@@ -0,0 +1,33 @@
+import numpy as np
+import pytest
+
+tifffile = pytest.importorskip("tifffile")
+
+from percell.domain.models import ImageMetadata
+from percell.domain.services.image_metadata_service import ImageMetadataService
+
+
+@pytest.fixture()
+def svc() -> ImageMetadataService:
+    return ImageMetadataService()
+
+
+def test_save_planes_with_metadata_streams_stack(svc: ImageMetadataService, tmp_path):
+    planes = [np.full((16, 16), c, dtype=np.uint16) for c in range(2)]
+    metadata = ImageMetadata(x_resolution=2.0, y_resolution=2.0,
+                             imagej_metadata={"axes": "CYX"})
+    out = tmp_path / "merged.tif"
+
+    assert svc.save_planes_with_metadata(planes, (2, 16, 16), np.uint16, out, metadata)
+
+    with tifffile.TiffFile(out) as tif:
+        assert tif.series[0].axes == "CYX"
+        data = tif.asarray()
+    assert data.shape == (2, 16, 16)
+    assert data[:, 0, 0].tolist() == [0, 1]
+    assert svc.extract_metadata(out).x_resolution == pytest.approx(2.0)
+
+
+def test_save_planes_with_metadata_reports_failure(svc: ImageMetadataService, tmp_path):
+    planes = [np.zeros((16, 16), dtype=np.uint16)]
+    assert not svc.save_planes_with_metadata(planes, (2, 16, 16), np.uint16, tmp_path / "bad.tif")
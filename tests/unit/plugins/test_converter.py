@@ -0,0 +1,107 @@
+"""Unit tests for the script-to-plugin converter."""
+import ast
+import json
+import tempfile
+from pathlib import Path
+from unittest.mock import patch
+
+from percell.plugins.converter import convert_script, main
+
+
+SCRIPT = '''
+import argparse
+import numpy
+import tifffile
+from pathlib import Path
+
+
+def main():
+    """Process the input directory."""
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--input-dir")
+    parser.add_argument("--output-dir")
+    args = parser.parse_args()
+    for path in Path(args.input_dir).glob("*.tif"):
+        tifffile.imread(path)
+
+
+if __name__ == "__main__":
+    main()
+'''
+
+
+class TestConvertScript:
+    """Test converting a standalone script into a plugin."""
+
+    def test_generated_plugin_is_valid_python(self):
+        """Test the generated plugin parses and keeps one import per line."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            tmp_path = Path(tmpdir)
+            script = tmp_path / "my_script.py"
+            script.write_text(SCRIPT)
+
+            plugin_file, metadata_file = convert_script(script, output_dir=tmp_path)
+
+            content = plugin_file.read_text()
+            ast.parse(content)
+            # The only escaped newline is the one inside the generated ui.info call
+            assert content.count("\\n") == 1
+            assert "\nimport numpy as np\n" in content
+            assert "\nimport tifffile\n" in content
+            assert "import argparse\nimport argparse" not in content
+            assert "requires_input_dir=True," in content
+
+            metadata = json.loads(metadata_file.read_text())
+            assert metadata["name"] == "my_script"
+            assert metadata["requires_input_dir"] is True
+            assert metadata["requires_output_dir"] is True
+
+    def test_leaves_no_temp_files(self):
+        """Test atomic writes clean up their temporary files."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            tmp_path = Path(tmpdir)
+            script = tmp_path / "other.py"
+            script.write_text(SCRIPT)
+
+            convert_script(script, output_dir=tmp_path)
+
+            assert not list(tmp_path.rglob("*.tmp"))
+
+    def test_function_local_imports_are_not_hoisted(self):
+        """Test imports inside functions stay out of the generated plugin's imports."""
+        script_source = SCRIPT.replace(
+            "    args = parser.parse_args()\n",
+            "    args = parser.parse_args()\n"
+            "    try:\n"
+            "        import optional_dependency\n"
+            "    except ImportError:\n"
+            "        optional_dependency = None\n",
+        )
+        with tempfile.TemporaryDirectory() as tmpdir:
+            tmp_path = Path(tmpdir)
+            script = tmp_path / "guarded.py"
+            script.write_text(script_source)
+
+            plugin_file, _ = convert_script(script, output_dir=tmp_path)
+
+            content = plugin_file.read_text()
+            assert "\nimport optional_dependency\n" not in content
+            assert "\nimport tifffile\n" in content
+
+    def test_main_rejects_scripts_with_the_same_plugin_name(self, capsys):
+        """Test batch conversion refuses scripts that would write the same plugin."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            tmp_path = Path(tmpdir)
+            (tmp_path / "a").mkdir()
+            (tmp_path / "b").mkdir()
+            first = tmp_path / "a" / "same.py"
+            second = tmp_path / "b" / "Same.py"
+            first.write_text(SCRIPT)
+            second.write_text(SCRIPT)
+
+            argv = ["converter", str(first), str(second), "--output", str(tmp_path / "out")]
+            with patch("sys.argv", argv):
+                assert main() == 1
+
+            assert "both convert to plugin 'same'" in capsys.readouterr().out
+            assert not (tmp_path / "out").exists()
@@ -0,0 +1,64 @@
+"""Unit tests for the intensity analysis plugin's ROI helpers."""
+import numpy as np
+import pytest
+
+pytest.importorskip("scipy")
+pytest.importorskip("skimage")
+
+from percell.plugins._intensity_analysis_base import IntensityAnalysisBSPlugin
+
+
+def _square_roi(name, x0, y0, size):
+    coords = np.array(
+        [[x0, y0], [x0 + size, y0], [x0 + size, y0 + size], [x0, y0 + size]],
+        dtype=np.float32,
+    )
+    return {'name': name, 'roi': None, 'coordinates': coords, 'bytes': b''}
+
+
+class TestEnlargeRois:
+    """Test ROI enlargement within per-ROI bounding boxes."""
+
+    def test_enlarged_outline_is_in_image_coordinates(self):
+        """Test an enlarged ROI grows by the requested pixels around its original position."""
+        plugin = IntensityAnalysisBSPlugin()
+        rois = [_square_roi('a', 200, 300, 10), _square_roi('b', 0, 0, 10)]
+
+        enlarged = plugin._enlarge_rois_with_imagej(rois, pixels=3)
+
+        coords = enlarged[0]['coordinates']
+        assert coords[:, 0].min() == pytest.approx(196.5)
+        assert coords[:, 0].max() == pytest.approx(213.5)
+        assert coords[:, 1].min() == pytest.approx(296.5)
+        assert coords[:, 1].max() == pytest.approx(313.5)
+        # ROIs touching the image origin are clipped there, not shifted
+        assert enlarged[1]['coordinates'].min() >= 0
+
+    def test_shrinking_and_empty_rois(self):
+        """Test negative enlargement shrinks ROIs and empty ROIs pass through."""
+        plugin = IntensityAnalysisBSPlugin()
+        empty = {'name': 'e', 'roi': None, 'coordinates': np.zeros((0, 2)), 'bytes': b''}
+
+        shrunk = plugin._enlarge_rois_with_imagej([_square_roi('a', 50, 50, 10), empty], pixels=-2)
+
+        coords = shrunk[0]['coordinates']
+        assert coords[:, 0].min() == pytest.approx(51.5)
+        assert coords[:, 0].max() == pytest.approx(58.5)
+        assert len(shrunk[1]['coordinates']) == 0
+
+
+class TestRoiPixels:
+    """Test per-ROI pixel extraction."""
+
+    def test_matches_whole_image_mask(self):
+        """Test windowed rasterization returns the same pixels as a full-image mask."""
+        plugin = IntensityAnalysisBSPlugin()
+        image = np.arange(64 * 80, dtype=np.float32).reshape(64, 80)
+        t = np.linspace(0, 2 * np.pi, 12, endpoint=False)
+        coords = np.column_stack((75 + 9 * np.cos(t), 30 + 7 * np.sin(t))).astype(np.float32)
+
+        full_mask = plugin._roi_to_mask(coords, image.shape)
+        pixels = plugin._roi_pixels(coords, image, image.shape)
+
+        np.testing.assert_array_equal(pixels, image[full_mask > 0])
+        assert len(plugin._roi_pixels(np.zeros((0, 2)), image, image.shape)) == 0
@@ -6,7 +6,7 @@ from unittest.mock import Mock, patch
 import argparse
 
 from percell.plugins.base import PerCellPlugin, PluginMetadata, LegacyPluginAdapter
-from percell.plugins.registry import PluginRegistry
+from percell.plugins.registry import PluginRegistry, _LazyPluginClass, _plugin_cache_path
 
 
 # Test fixtures
@@ -135,6 +135,28 @@ class TestPluginRegistry:
         assert plugin1 in all_plugins
         assert plugin2 in all_plugins
 
+    def test_get_all_plugins_refreshes_after_register(self, registry, sample_plugin_class, sample_metadata):
+        """Test the memoized plugin list is rebuilt when a plugin is registered."""
+        registry.register(sample_plugin_class(), sample_metadata)
+        assert len(registry.get_all_plugins()) == 1
+
+        metadata2 = PluginMetadata(
+            name="test_plugin_2",
+            version="1.0.0",
+            description="Test plugin 2",
+            author="Test"
+        )
+
+        class TestPlugin2(PerCellPlugin):
+            def execute(self, ui, args):
+                return args
+
+        registry.register_class(TestPlugin2, metadata2)
+
+        all_plugins = registry.get_all_plugins()
+        assert len(all_plugins) == 2
+        assert registry.get_plugin("test_plugin_2") in all_plugins
+
     def test_register_class_without_metadata(self, registry):
         """Test registering a class without explicit metadata."""
         class SimplePlugin(PerCellPlugin):
@@ -274,6 +296,122 @@ class FailingPlugin(PerCellPlugin):
             # AST discovery logs but doesn't register without successful import
             # This is expected behavior - plugin is discovered but not registered
 
+    def test_plugins_with_unrecognised_bases_are_discovered(self, registry):
+        """Test files the AST scan cannot match are still imported and registered."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            plugin_dir = Path(tmpdir)
+
+            (plugin_dir / "indirect_plugin.py").write_text(
+                "from percell.plugins.base import PerCellPlugin, PluginMetadata\n"
+                "\n"
+                "class Base(PerCellPlugin):\n"
+                "    _INTERNAL_BASE_CLASS = True\n"
+                "\n"
+                "class Indirect(Base):\n"
+                "    _INTERNAL_BASE_CLASS = False\n"
+                "    METADATA = PluginMetadata(\n"
+                "        name='indirect', version='1.0.0',\n"
+                "        description='Indirect plugin', author='Test')\n"
+                "\n"
+                "    def execute(self, ui, args):\n"
+                "        return args\n"
+            )
+
+            registry.discover_plugins(plugin_dir)
+
+            assert "indirect" in registry.get_plugin_names()
+
+    def test_concurrent_import_deadlock_is_retried_serially(self, registry):
+        """Test a module-lock deadlock in the import pool falls back to a serial import."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            plugin_dir = Path(tmpdir)
+            (plugin_dir / "deadlock_plugin.py").write_text(
+                "def show_deadlock_retry_plugin(ui, args):\n"
+                "    return args\n"
+            )
+
+            real_exec = PluginRegistry._exec_plugin_module
+            calls = []
+
+            def exec_once_deadlocked(self, plugin_file):
+                calls.append(plugin_file)
+                if len(calls) == 1:
+                    raise RuntimeError("deadlock detected by _ModuleLock")
+                return real_exec(self, plugin_file)
+
+            with patch.object(PluginRegistry, "_exec_plugin_module", exec_once_deadlocked):
+                registry.discover_plugins(plugin_dir)
+
+            assert len(calls) == 2
+            assert "deadlock_retry" in registry.get_plugin_names()
+
+    def test_import_error_is_not_retried(self, registry):
+        """Test a module with a missing dependency is executed only once."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            plugin_dir = Path(tmpdir)
+            (plugin_dir / "missing_dep_plugin.py").write_text(
+                "import nonexistent_module\n"
+            )
+
+            real_exec = PluginRegistry._exec_plugin_module
+            calls = []
+
+            def counting_exec(self, plugin_file):
+                calls.append(plugin_file)
+                return real_exec(self, plugin_file)
+
+            with patch.object(PluginRegistry, "_exec_plugin_module", counting_exec), \
+                    patch.object(PluginRegistry, "_discover_plugin_from_ast") as ast_fallback:
+                registry.discover_plugins(plugin_dir)
+
+            assert len(calls) == 1
+            ast_fallback.assert_called_once_with(plugin_dir / "missing_dep_plugin.py")
+
+    def test_discovery_cache_reused_until_files_change(self, monkeypatch):
+        """Test cached discovery registers lazily and is invalidated by edits."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            plugin_dir = Path(tmpdir) / "plugins"
+            plugin_dir.mkdir()
+            monkeypatch.setenv("HOME", str(Path(tmpdir) / "home"))
+
+            plugin_file = plugin_dir / "cached_plugin.py"
+            plugin_code = '''
+from percell.plugins.base import PerCellPlugin, PluginMetadata
+
+METADATA = PluginMetadata(
+    name="cached_plugin",
+    version="{version}",
+    description="Cached plugin",
+    author="Test"
+)
+
+class CachedPlugin(PerCellPlugin):
+    METADATA = METADATA
+
+    def execute(self, ui, args):
+        return args
+'''
+            plugin_file.write_text(plugin_code.format(version="1.0.0"))
+
+            PluginRegistry().discover_plugins(plugin_dir)
+            assert _plugin_cache_path(plugin_dir).exists()
+            assert list(plugin_dir.iterdir()) == [plugin_file]
+
+            # Warm start: served from the cache without importing the module
+            warm = PluginRegistry()
+            warm.discover_plugins(plugin_dir)
+            assert isinstance(warm._plugin_classes["cached_plugin"], _LazyPluginClass)
+            plugin = warm.get_plugin("cached_plugin")
+            assert type(plugin).__name__ == "CachedPlugin"
+            assert plugin.metadata.version == "1.0.0"
+
+            # Editing a plugin file (here also changing its size) invalidates the cache
+            plugin_file.write_text(plugin_code.format(version="10.0.0"))
+            edited = PluginRegistry()
+            edited.discover_plugins(plugin_dir)
+            assert edited.get_metadata("cached_plugin").version == "10.0.0"
+            assert not isinstance(edited._plugin_classes["cached_plugin"], _LazyPluginClass)
+
 
 class TestLegacyPluginAdapter:
     """Test the legacy plugin adapter."""